@@ -1,11 +1,16 @@
+import os
 import math
+import hashlib
 
 import numpy as np
 import pygame
 
-import random
+from collections import OrderedDict
 from enum import Enum
-from PIL import Image, ImageSequence
+
+from Startup import startup
+from Rng import BatchedStream, SimulationRNG
+from Profiler import profiler
 
 
 class GameState(Enum):
@@ -40,6 +45,21 @@ class EntitySprite(Enum):
         return f"{self.name.capitalize()}.gif"
 
 
+class TimeWarp(Enum):
+    X1 = ('1x', 1)
+    X4 = ('4x', 4)
+    X16 = ('16x', 16)
+    MAX = ('Max', 0)
+
+    def __init__(self, label, factor):
+        self.label = label
+        self.factor = factor
+
+    def next(self):
+        warps = list(TimeWarp)
+        return warps[(warps.index(self) + 1) % len(warps)]
+
+
 class TileType(Enum):
     GRASS = (72, 156, 76)
     SNOW = (230, 228, 228)
@@ -72,14 +92,21 @@ class Condition(Enum):
 
 
 class ConditionManager:
-    def __init__(self):
+    def __init__(self, rng: BatchedStream = None, probabilities: list = None):
+        self.rng = rng if rng is not None else SimulationRNG().conditions
         self.current = Condition.NONE
 
+        # Chance of each Condition, in declaration order, at every generation
+        self.probabilities = probabilities if probabilities is not None else Condition.get_probability()
+
         # Only applicable for Wind
         self.direction = (0, 0)
 
     def __call__(self, *args, **kwargs):
-        self.current = np.random.choice(list(Condition), p=Condition.get_probability())
+        self.set(list(Condition)[self.rng.index_of(self.probabilities)])
+
+    def set(self, condition: Condition):
+        self.current = condition
 
         if self.current == Condition.WIND:
             self._pick_direction()
@@ -91,75 +118,205 @@ class ConditionManager:
         self.direction = (0, 0)
 
     def _pick_direction(self):
-        angle = random.uniform(0, 2 * math.pi)
+        angle = self.rng.uniform(0, 2 * math.pi)
         self.direction = (math.cos(angle), math.sin(angle))
 
 
 class IDGenerator:
-    def __init__(self):
+    # Ids are handed out in tiers [0, 100), [100, 1000), [1000, 10000)... Within a tier the order is a keyed
+    # Feistel permutation of the tier's counter, so the whole state is a few integers
+    rounds = 4
+    mask64 = (1 << 64) - 1
+
+    def __init__(self, rng: BatchedStream = None):
+        self.rng = rng if rng is not None else SimulationRNG().ids
+        self.key = 0
+        self.low = 0
         self.max_id = 0
-        self.next = []
+        self.count = 0
         self.reset()
 
     def __call__(self, *args, **kwargs):
-        if len(self.next) == 0:
-            self.next = list(range(self.max_id, self.max_id * 10))
-            random.shuffle(self.next)
-            self.max_id *= 10
+        if self.count == self.max_id - self.low:
+            self.low, self.max_id, self.count = self.max_id, self.max_id * 10, 0
 
-        return self.next.pop()
+        agent_id = self.low + self._permute(self.count, self.max_id - self.low)
+        self.count += 1
+        return agent_id
 
     def reset(self):
+        self.key = int(self.rng.generator.integers(0, 1 << 63))
+        self.low = 0
         self.max_id = 100
-        self.next = list(range(0, self.max_id))
-        random.shuffle(self.next)
+        self.count = 0
+
+    def get_state(self):
+        return self.key, self.low, self.max_id, self.count
+
+    def set_state(self, state):
+        self.key, self.low, self.max_id, self.count = (int(value) for value in state)
+
+    def _permute(self, value: int, size: int):
+        # Balanced Feistel network over the smallest even bit width covering size, values past size are
+        # walked through the network again until they land inside it (on average fewer than four passes)
+        half = max(1, ((size - 1).bit_length() + 1) // 2)
+        half_mask = (1 << half) - 1
+
+        while True:
+            left, right = value >> half, value & half_mask
+            for i in range(self.rounds):
+                left, right = right, left ^ (self._mix(right, i) & half_mask)
+            value = (left << half) | right
+
+            if value < size:
+                return value
+
+    def _mix(self, value: int, round_index: int):
+        # splitmix64 finaliser over the value, round, tier and key
+        x = (value ^ (round_index << 56) ^ (self.low * 0x9e3779b97f4a7c15) ^ self.key) & self.mask64
+        x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & self.mask64
+        x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & self.mask64
+        return x ^ (x >> 31)
 
 
 class SpriteLoader:
-    def __init__(self):
-        # Entity
+    def __init__(self, cache_limit: int = 32 * 1024 * 1024, scale_step: float = 0.05, ring_alpha_step: int = 8,
+                 atlas_path: str = 'assets/atlas.cache.npz'):
+        # Scaled / flipped frames and energy rings, least recently used evicted past cache_limit bytes
+        self.scaled_cache = OrderedDict()
+        self.cache_limit = cache_limit
+        self.cache_size = 0
+        self.scale_step = scale_step
+        self.ring_alpha_step = ring_alpha_step
+
+        # Every frame is packed into one atlas surface and handed out as subsurfaces of it.
+        # The decoded atlas is kept on disk and rebuilt only when an asset file changes.
+        self.atlas_path = atlas_path
+        self.atlas, self.frame_table = self._load_atlas()
+        self._slice_atlas()
+
+    def convert_to_display(self):
+        # Needs the display mode set, afterwards blits skip the per-call pixel format conversion
+        self.atlas = self.atlas.convert_alpha()
+        self._slice_atlas()
+
+        self.scaled_cache.clear()
+        self.cache_size = 0
+
+    def _slice_atlas(self):
         self.entity_sprite = {}
+        self.tile_sprite = []
+        self.food_sprite = []
+        self.condition_sprite = {}
 
+        for family, name, rect in self.frame_table:
+            frame = self.atlas.subsurface(rect)
+            if family == 'entity':
+                self.entity_sprite.setdefault(name, []).append(frame)
+            elif family == 'tile':
+                self.tile_sprite.append(frame)
+            elif family == 'food':
+                self.food_sprite.append(frame)
+            else:
+                self.condition_sprite.setdefault(name, []).append(frame)
+
+    def _load_atlas(self):
+        signature = self._asset_signature()
+
+        try:
+            with np.load(self.atlas_path, allow_pickle=False) as cached:
+                if str(cached['signature']) == signature:
+                    pixels = cached['pixels']
+                    frame_table = [(str(family), str(name), tuple(int(v) for v in rect))
+                                   for family, name, rect in zip(cached['families'], cached['names'], cached['rects'])]
+                    return self._atlas_surface(pixels), frame_table
+        except (OSError, KeyError, ValueError):
+            pass
+
+        with startup.step('decode assets'):
+            frames = self._decode_frames()
+            pixels, rects = self._pack([image for _, _, image in frames])
+        frame_table = [(family, name, rect) for (family, name, _), rect in zip(frames, rects)]
+
+        # A cache that cannot be written only costs the next launch a decode
+        try:
+            with open(self.atlas_path + '.tmp', 'wb') as file:
+                np.savez(file, signature=np.array(signature), pixels=pixels,
+                         families=np.array([family for family, _, _ in frame_table]),
+                         names=np.array([name for _, name, _ in frame_table]),
+                         rects=np.array(rects, dtype=np.int32).reshape(-1, 4))
+            os.replace(self.atlas_path + '.tmp', self.atlas_path)
+        except OSError:
+            pass
+
+        return self._atlas_surface(pixels), frame_table
+
+    def _asset_signature(self):
+        digest = hashlib.sha1()
+        for folder in ('assets/Entity', 'assets/Tile', 'assets/Food', 'assets/Condition'):
+            for name in sorted(os.listdir(folder)):
+                stat = os.stat(os.path.join(folder, name))
+                digest.update(f'{folder}/{name}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+
+        return digest.hexdigest()
+
+    def _decode_frames(self):
+        # PIL is only needed when the atlas cache is missing or stale
+        from PIL import Image, ImageSequence
+
+        frames = []
+
+        # Entity
         for _, item in enumerate(EntitySprite):
             gif = Image.open(f'assets/Entity/{item.get_path()}')
-
-            frames = [pygame.image.frombytes(frame.convert("RGBA").tobytes(), frame.size, "RGBA")
-                      for frame in ImageSequence.Iterator(gif)]
-
-            self.entity_sprite[item.name] = frames
+            for frame in ImageSequence.Iterator(gif):
+                frames.append(('entity', item.name, np.asarray(frame.convert("RGBA"))))
 
         # Tile
-        self.tile_sprite = []
         for i in range(1, 5):
-            tile = Image.open(f'assets/Tile/Tile{i}.png')
-            self.tile_sprite.append(pygame.image.frombytes(tile.convert("RGBA").tobytes(), tile.size, "RGBA"))
+            frames.append(('tile', str(i), np.asarray(Image.open(f'assets/Tile/Tile{i}.png').convert("RGBA"))))
 
         # Food
-        self.food_sprite = []
         for i in range(1, 7):
-            food = Image.open(f'assets/Food/Food{i}.png')
-            self.food_sprite.append(pygame.image.frombytes(food.convert("RGBA").tobytes(), food.size, "RGBA"))
+            frames.append(('food', str(i), np.asarray(Image.open(f'assets/Food/Food{i}.png').convert("RGBA"))))
 
         # Condition
-        self.condition_sprite = {}
         for _, item in enumerate(Condition):
             if item == Condition.NONE:
                 continue
 
-            sheet = Image.open(f"assets/Condition/{item.get_path()}").convert("RGBA")
+            sheet = np.asarray(Image.open(f"assets/Condition/{item.get_path()}").convert("RGBA"))
 
+            # Crop a 16x16 tile from each vertical position
             tile_width, tile_height = 16, 16
-            sheet_width, sheet_height = sheet.size
-            num_frames = sheet_height // tile_height
+            for i in range(sheet.shape[0] // tile_height):
+                frames.append(('condition', item.name, sheet[i * tile_height:(i + 1) * tile_height, :tile_width]))
+
+        return frames
+
+    def _pack(self, images, width: int = 256):
+        # Shelf packing, tallest images first
+        width = max([width] + [image.shape[1] for image in images])
+        rects = [None] * len(images)
 
-            frames = []
-            for i in range(num_frames):
-                # Crop a 16x16 tile from each vertical position
-                frame = sheet.crop((0, i * tile_height, tile_width, (i + 1) * tile_height))
-                surface = pygame.image.frombytes(frame.tobytes(), frame.size, "RGBA")
-                frames.append(surface.copy())
+        x, y, shelf = 0, 0, 0
+        for i in sorted(range(len(images)), key=lambda i: -images[i].shape[0]):
+            height, image_width = images[i].shape[:2]
+            if x + image_width > width:
+                x, y, shelf = 0, y + shelf, 0
 
-            self.condition_sprite[item.name] = frames
+            rects[i] = (x, y, image_width, height)
+            x += image_width
+            shelf = max(shelf, height)
+
+        pixels = np.zeros((y + shelf, width, 4), dtype=np.uint8)
+        for (x, y, image_width, height), image in zip(rects, images):
+            pixels[y:y + height, x:x + image_width] = image
+
+        return pixels, rects
+
+    def _atlas_surface(self, pixels: np.ndarray):
+        return pygame.image.frombytes(np.ascontiguousarray(pixels).tobytes(), (pixels.shape[1], pixels.shape[0]), "RGBA")
 
     def get_condition_sprite_at_frame(self, sprite, frame):
         frame = min(len(self.condition_sprite[sprite.name]) - 1, max(frame, 0))
@@ -175,8 +332,64 @@ class SpriteLoader:
     def get_num_frame_in_entity_sprite(self, sprite):
         return len(self.entity_sprite[sprite.name])
 
-    def get_random_tile_index(self):
-        return np.random.choice([0, 1, 2, 3], p=[0.05, 0.5, 0.05, 0.40])
+    def get_scaled_entity_sprite(self, sprite, frame, scale: float, flipped: bool = False):
+        frame = min(len(self.entity_sprite[sprite.name]) - 1, max(frame, 0))
+        return self._get_scaled(('entity', sprite.name, frame), self.entity_sprite[sprite.name][frame],
+                                scale, flipped)
+
+    def get_scaled_condition_sprite(self, sprite, frame, scale: float):
+        frame = min(len(self.condition_sprite[sprite.name]) - 1, max(frame, 0))
+        return self._get_scaled(('condition', sprite.name, frame), self.condition_sprite[sprite.name][frame],
+                                scale, False)
+
+    def get_energy_ring(self, radius: float, energy: float):
+        # Rings are shared by every agent of the same radius and quantized energy level
+        radius = max(1, round(radius))
+        alpha = min(255, max(0, int((energy / 100) * 255)))
+        alpha -= alpha % self.ring_alpha_step
+
+        def draw():
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (180, 0, 0, alpha), (radius, radius), radius, width=2)
+            return surface
+
+        return self._cached(('ring', radius, alpha), draw)
+
+    def _get_scaled(self, source_key, source, scale: float, flipped: bool):
+        # Scales are bucketed so agents of similar size share one surface
+        bucket = max(1, round(scale / self.scale_step))
+
+        def draw():
+            bucket_scale = bucket * self.scale_step
+            surface = pygame.transform.scale(source, (int(source.get_width() * bucket_scale),
+                                                      int(source.get_height() * bucket_scale)))
+            if flipped:
+                surface = pygame.transform.flip(surface, True, False)
+            return surface
+
+        return self._cached(source_key + (bucket, flipped), draw)
+
+    def _cached(self, key, draw):
+        surface = self.scaled_cache.get(key)
+        if surface is not None:
+            self.scaled_cache.move_to_end(key)
+            return surface
+
+        surface = draw()
+        self.scaled_cache[key] = surface
+        self.cache_size += surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+        while self.cache_size > self.cache_limit and len(self.scaled_cache) > 1:
+            _, evicted = self.scaled_cache.popitem(last=False)
+            self.cache_size -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+
+        return surface
+
+    tile_probability = [0.05, 0.5, 0.05, 0.40]
+
+    def get_random_tile_indices(self, rng: BatchedStream, shape: tuple[int, int]):
+        # A whole ground layout in one draw
+        return rng.generator.choice(len(self.tile_probability), size=shape, p=self.tile_probability)
 
     def get_tile_size(self):
         return self.tile_sprite[0].get_height()
@@ -184,43 +397,267 @@ class SpriteLoader:
     def get_tile_at(self, idx: int):
         return self.tile_sprite[idx]
 
-    def get_random_food_index(self):
-        return np.random.randint(0, len(self.food_sprite))
+    def get_random_food_index(self, rng: BatchedStream):
+        return rng.integers(0, len(self.food_sprite))
+
+    def get_num_food_sprites(self):
+        return len(self.food_sprite)
 
     def get_food_sprite(self, idx):
         return self.food_sprite[idx]
 
+    def get_scaled_food_sprite(self, idx, scale: float):
+        if scale == 1:
+            return self.food_sprite[idx]
+
+        return self._get_scaled(('food', idx), self.food_sprite[idx], scale, False)
+
+
+class CachedFont:
+    # Same render / size interface as pygame.font.Font, rendered text shared through the registry
+    def __init__(self, registry: "FontRegistry", size: int):
+        self.registry = registry
+        self.point_size = size
+        self.font = pygame.font.Font(registry.path, size)
+
+    def size(self, text: str):
+        return self.font.size(text)
+
+    def render(self, text: str, antialias: bool, color):
+        return self.registry.render(self, text, antialias, color)
+
+
+class FontRegistry:
+    def __init__(self, path: str = 'assets/PressStart2P-Regular.ttf', cache_limit: int = 512):
+        self.path = path
+        self.fonts = {}
+
+        # Rendered text surfaces, least recently used evicted past cache_limit entries
+        self.rendered = OrderedDict()
+        self.cache_limit = cache_limit
+
+    def get(self, size: int):
+        if size not in self.fonts:
+            self.fonts[size] = CachedFont(self, size)
+
+        return self.fonts[size]
+
+    def render(self, font: CachedFont, text: str, antialias: bool, color):
+        key = (font.point_size, text, tuple(color), antialias)
+
+        surface = self.rendered.get(key)
+        if surface is not None:
+            self.rendered.move_to_end(key)
+            return surface
+
+        surface = font.font.render(text, antialias, color)
+        self.rendered[key] = surface
+        if len(self.rendered) > self.cache_limit:
+            self.rendered.popitem(last=False)
+
+        return surface
+
+
+# Shared by every UI element, callers must not draw onto the returned text surfaces
+fonts = FontRegistry()
+
+
+class Camera:
+    # Maps world coordinates to the screen, (x, y) is the world point at the top-left corner of the view
+    def __init__(self, view_size: tuple[int, int], world_size: tuple[int, int], max_zoom: float = 4.0,
+                 zoom_step: float = 0.05):
+        self.view_width, self.view_height = view_size
+        self.world_width, self.world_height = world_size
+        self.x, self.y = 0.0, 0.0
+        self.zoom = 1.0
+
+        # Zoomed out no further than the whole world fitting in the view, in steps that sprite scaling shares
+        self.zoom_step = zoom_step
+        self.min_zoom = min(1.0, self.view_width / self.world_width, self.view_height / self.world_height)
+        self.max_zoom = max_zoom
+
+    @property
+    def view_rect(self):
+        # Visible world area as (left, top, right, bottom)
+        return self.x, self.y, self.x + self.view_width / self.zoom, self.y + self.view_height / self.zoom
+
+    @property
+    def key(self):
+        return round(self.x * self.zoom), round(self.y * self.zoom), self.zoom
+
+    def to_screen(self, x: float, y: float):
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def to_world(self, x: float, y: float):
+        return x / self.zoom + self.x, y / self.zoom + self.y
+
+    def pan(self, dx: float, dy: float):
+        # Distances in screen pixels
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self._clamp()
+
+    def zoom_at(self, factor: float, screen_x: float, screen_y: float):
+        # The world point under the cursor stays under it
+        world_x, world_y = self.to_world(screen_x, screen_y)
+
+        # At least one whole step per notch, a small factor would otherwise round back to the same zoom
+        steps = round(self.zoom / self.zoom_step)
+        target = round(self.zoom * factor / self.zoom_step)
+        if target == steps and factor != 1.0:
+            target = steps + (1 if factor > 1.0 else -1)
+        self.zoom = min(self.max_zoom, max(self.min_zoom, target * self.zoom_step))
+
+        self.x, self.y = world_x - screen_x / self.zoom, world_y - screen_y / self.zoom
+        self._clamp()
+
+    def reset(self):
+        self.x, self.y = 0.0, 0.0
+        self.zoom = 1.0
+
+    def _clamp(self):
+        self.x = min(max(0.0, self.x), max(0.0, self.world_width - self.view_width / self.zoom))
+        self.y = min(max(0.0, self.y), max(0.0, self.world_height - self.view_height / self.zoom))
+
 
 class Window:
-    def __init__(self, sl: SpriteLoader, cm: ConditionManager, fps: int = 60):
+    def __init__(self, sl: SpriteLoader, cm: ConditionManager, rng: BatchedStream = None, fps: int = 60,
+                 world_size: tuple[int, int] = None):
         self.width = 1000
         self.height = 600
         self.fps = fps
+
+        # The arena entities live in, the screen shows the part of it the camera looks at
+        self.world_width, self.world_height = world_size if world_size is not None else (self.width, self.height)
+        self.camera = Camera((self.width, self.height), (self.world_width, self.world_height))
         self.clock = pygame.time.Clock()
+
+        # Seconds since the previous frame
+        self.frame_time = 0.0
+
+        # Regions changed since the last tick, a full flip when too many or when invalidated
+        self.dirty = []
+        self.full_redraw = True
+        self.max_dirty_rects = 256
         self.sl = sl
         self.cm = cm
 
         self.screen = pygame.display.set_mode((self.width, self.height), pygame.SCALED | pygame.HWACCEL)
         pygame.display.set_caption("Evolution Playground")
+        self.sl.convert_to_display()
 
-        self.tile_ground = []
-        for x in range(0, self.width, self.sl.get_tile_size()):
-            row = []
-            for y in range(0, self.height, self.sl.get_tile_size()):
-                row.append((self.sl.get_random_tile_index(), x, y))
-            self.tile_ground.append(row)
+        # Tile index per (column, row) of the whole world, from the tiles stream so a seed reproduces it too
+        rng = rng if rng is not None else SimulationRNG().tiles
+        self.tile_size = self.sl.get_tile_size()
+        self.tile_ground = self.sl.get_random_tile_indices(rng, (-(-self.world_width // self.tile_size),
+                                                                 -(-self.world_height // self.tile_size)))
+
+        # Visible ground baked into one surface per tile colour, for the current window size and camera view
+        self.backgrounds = {}
+        self.background_view = None
+        self.scaled_tiles = {}
 
         self.clear()
 
+    def get_background(self):
+        view = (self.width, self.height, self.camera.key)
+        if self.background_view != view:
+            self.backgrounds = {}
+            self.background_view = view
+
+        tile_type = self.cm.current.tile_type
+        if tile_type not in self.backgrounds:
+            background = pygame.Surface((self.width, self.height)).convert()
+            background.fill(tile_type.value)
+            background.blits(self._visible_tiles(), doreturn=False)
+
+            self.backgrounds[tile_type] = background
+
+        return self.backgrounds[tile_type]
+
+    def _visible_tiles(self):
+        # Only the tiles the camera sees, scaled once per zoom level to cover their share of the screen
+        zoom = self.camera.zoom
+        if zoom not in self.scaled_tiles:
+            size = math.ceil(self.tile_size * zoom)
+            self.scaled_tiles = {zoom: [pygame.transform.scale(self.sl.get_tile_at(idx), (size, size))
+                                        for idx in range(len(self.sl.tile_probability))]}
+        tiles = self.scaled_tiles[zoom]
+
+        left, top, right, bottom = self.camera.view_rect
+        cols, rows = self.tile_ground.shape
+        col_range = range(max(0, int(left // self.tile_size)), min(cols, int(right // self.tile_size) + 1))
+        row_range = range(max(0, int(top // self.tile_size)), min(rows, int(bottom // self.tile_size) + 1))
+
+        blits = []
+        for col in col_range:
+            for row in row_range:
+                x, y = self.camera.to_screen(col * self.tile_size, row * self.tile_size)
+                blits.append((tiles[self.tile_ground[col, row]], (round(x), round(y))))
+
+        return blits
+
+    def clear(self):
+        with profiler.phase('clear'):
+            self.screen.blit(self.get_background(), (0, 0))
+
+    def mark_dirty(self, rect):
+        if rect is not None:
+            self.dirty.append(rect)
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def tick(self):
+        # Push only what changed, nothing at all when the screen is idle
+        with profiler.phase('present'):
+            if self.full_redraw or len(self.dirty) > self.max_dirty_rects:
+                pygame.display.flip()
+            elif self.dirty:
+                pygame.display.update(self.dirty)
+
+        self.dirty = []
+        self.full_redraw = False
+        startup.frame_presented()
+
+        with profiler.phase('wait'):
+            self.frame_time = self.clock.tick(self.fps) / 1000
+        profiler.end_frame()
+
+
+class HeadlessSpriteLoader:
+    # Answers the lookups the simulation needs without decoding any image
+    def __init__(self, food_sprite_count: int = 6):
+        self.food_sprite_count = food_sprite_count
+
+    def get_num_frame_in_entity_sprite(self, sprite):
+        return 1
+
+    def get_random_food_index(self, rng: BatchedStream):
+        return rng.integers(0, self.food_sprite_count)
+
+    def get_num_food_sprites(self):
+        return self.food_sprite_count
+
+
+class HeadlessWindow:
+    # Arena dimensions only, no display surface and no frame clock
+    def __init__(self, width: int = 1000, height: int = 600):
+        self.width = width
+        self.height = height
+        self.world_width = width
+        self.world_height = height
+        self.screen = None
+        self.camera = None
+
     def clear(self):
-        self.screen.fill(self.cm.current.tile_type.value)
+        pass
+
+    def mark_dirty(self, rect):
+        pass
 
-        for i in range(len(self.tile_ground)):
-            for j in range(len(self.tile_ground[0])):
-                idx, x, y = self.tile_ground[i][j]
-                sprite = self.sl.get_tile_at(idx)
-                self.screen.blit(sprite, (x, y))
+    def invalidate(self):
+        pass
 
     def tick(self):
-        pygame.display.flip()
-        self.clock.tick(self.fps)
+        pass
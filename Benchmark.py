@@ -0,0 +1,168 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+# Rendering goes to an offscreen surface, must be set before pygame is imported
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import numpy as np
+import pygame
+
+from App import SpriteLoader, Window, IDGenerator, ConditionManager, Condition, GameState
+from main import Simulation
+from Headless import HeadlessSimulation, run_headless
+from Rng import SimulationRNG
+
+AGENT_COUNTS = (10, 100, 1000, 10000)
+FOOD_COUNTS = (100, 1000)
+
+
+class RenderSimulation(Simulation):
+    def __init__(self, vectorized: bool = True, seed: int = None, **params):
+        # Same services as the game, on the dummy video driver and without a frame cap
+        self.rng = SimulationRNG(seed)
+        self.sl = SpriteLoader()
+        self.idg = IDGenerator(self.rng.ids)
+        self.cm = ConditionManager(self.rng.conditions)
+        pygame.init()
+
+        # The dummy driver cannot create a second renderer on the same display, every scenario restarts it
+        pygame.display.quit()
+        pygame.display.init()
+        self.window = Window(self.sl, self.cm, self.rng.tiles, fps=0)
+
+        self.setup(vectorized)
+        for name, value in params.items():
+            setattr(self, name, value)
+
+        self.reset()
+        self.game_state = GameState.SIM_RUNNING
+
+    def step_frame(self):
+        # Exactly one simulation step per frame, independent of how long the frame took
+        self.window.frame_time = self.sim_timestep
+        self.window.clear()
+        done = self.run_simulation([], False)
+        self.ui_sim_bar.render([], self.generation, len(self.agents), len(self.foods), self.time_warp)
+        self.window.tick()
+        return done
+
+
+def set_condition(sim: Simulation, condition: Condition):
+    sim.cm.set(condition)
+
+
+def time_ticks(step, ticks: int):
+    # Steps until the generation ends or ticks is reached, ticks per second of wall time
+    done_ticks = 0
+    begin = time.perf_counter()
+    while done_ticks < ticks:
+        done_ticks += 1
+        if step():
+            break
+    elapsed = time.perf_counter() - begin
+
+    return {'ticks': done_ticks, 'seconds': elapsed, 'ticks_per_sec': done_ticks / elapsed if elapsed > 0 else 0.0}
+
+
+def bench_simulation(agents: int, food: int, condition: Condition, ticks: int, value: int):
+    sim = HeadlessSimulation(seed=value, initial_population=agents, initial_food_amount=food)
+    set_condition(sim, condition)
+
+    return {'name': f'sim/{agents}a/{food}f/{condition.label.lower()}', 'kind': 'simulation',
+            'agents': agents, 'food': food, 'condition': condition.label,
+            **time_ticks(sim.step_simulation, ticks)}
+
+
+def bench_render(agents: int, food: int, ticks: int, value: int):
+    sim = RenderSimulation(seed=value, initial_population=agents, initial_food_amount=food)
+    set_condition(sim, Condition.NONE)
+
+    return {'name': f'render/{agents}a/{food}f', 'kind': 'render', 'agents': agents, 'food': food,
+            'condition': Condition.NONE.label, **time_ticks(sim.step_frame, ticks)}
+
+
+def bench_auto_run(agents: int, food: int, generations: int, value: int):
+    begin = time.perf_counter()
+    records = run_headless(generations, seed=value, initial_population=agents, initial_food_amount=food)
+    elapsed = time.perf_counter() - begin
+    ticks = sum(record['ticks'] for record in records)
+
+    return {'name': f'auto/{agents}a/{food}f/{generations}g', 'kind': 'auto', 'agents': agents, 'food': food,
+            'generations': len(records), 'ticks': ticks, 'seconds': elapsed,
+            'ticks_per_sec': ticks / elapsed if elapsed > 0 else 0.0}
+
+
+def run_suite(agent_counts=AGENT_COUNTS, food_counts=FOOD_COUNTS, ticks: int = 300, generations: int = 20,
+              value: int = 0, render: bool = True):
+    results = []
+    for agents in agent_counts:
+        for food in food_counts:
+            for condition in Condition:
+                results.append(bench_simulation(agents, food, condition, ticks, value))
+
+            if render:
+                results.append(bench_render(agents, food, ticks, value))
+
+    for agents, food in ((10, 100), (100, 1000)):
+        results.append(bench_auto_run(agents, food, generations, value))
+
+    return results
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pygame': pygame.version.ver,
+            'machine': platform.machine(), 'system': platform.system(),
+            'video_driver': os.environ.get('SDL_VIDEODRIVER')}
+
+
+def compare(results: list, baseline: list, tolerance: float):
+    # A scenario regresses when its ticks/sec fell more than tolerance (a fraction) below the baseline
+    previous = {result['name']: result for result in baseline}
+    comparison = []
+    for result in results:
+        if result['name'] not in previous or previous[result['name']]['ticks_per_sec'] <= 0:
+            continue
+
+        ratio = result['ticks_per_sec'] / previous[result['name']]['ticks_per_sec']
+        comparison.append({'name': result['name'], 'baseline': previous[result['name']]['ticks_per_sec'],
+                           'current': result['ticks_per_sec'], 'ratio': ratio, 'regression': ratio < 1 - tolerance})
+
+    return comparison
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Seeded simulation and rendering benchmarks, JSON on stdout')
+    parser.add_argument('--agents', type=int, nargs='+', default=list(AGENT_COUNTS))
+    parser.add_argument('--food', type=int, nargs='+', default=list(FOOD_COUNTS))
+    parser.add_argument('--ticks', type=int, default=300, help='Maximum ticks per scenario')
+    parser.add_argument('--generations', type=int, default=20, help='Generations of the auto-run scenarios')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-render', action='store_true', help='Skip the simulation+render scenarios')
+    parser.add_argument('--baseline', default=None, help='Earlier output to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed ticks/sec drop before a regression')
+    parser.add_argument('--out', default=None, help='Also write the report to this file, e.g. a new baseline')
+    args = parser.parse_args()
+
+    report = {'environment': environment(), 'seed': args.seed,
+              'results': run_suite(args.agents, args.food, args.ticks, args.generations, args.seed,
+                                   render=not args.no_render)}
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            report['comparison'] = compare(report['results'], json.load(file)['results'], args.tolerance)
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+    if args.out is not None:
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    # Non-zero exit so a regression fails a CI step
+    if any(entry['regression'] for entry in report.get('comparison', [])):
+        sys.exit(1)
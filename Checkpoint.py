@@ -0,0 +1,180 @@
+import os
+import json
+import threading
+
+import numpy as np
+
+from App import Condition, EntitySprite, GameState, TimeWarp
+from Entity import Agent, Food
+from Utils import Position
+
+# Simulation attributes restored as they were saved
+PARAMS = ('generation', 'initial_food_amount', 'initial_population', 'food_replenish_const', 'mutation_chance',
+          'mutation_strength', 'max_offspring')
+
+AGENT_FIELDS = {'id': np.int64, 'generation': np.int64, 'parent1_id': np.int64, 'parent2_id': np.int64,
+                'speed': np.float64, 'size': np.float64, 'energy': np.float64, 'eaten': np.int64,
+                'mutated': bool, 'mutation_speed_offset': np.float64, 'mutation_size_offset': np.float64,
+                'current_frame': np.int64, 'sprite_scale': np.float64}
+
+
+def capture(sim):
+    # Copies everything a checkpoint needs, cheap enough for the frame loop; writing is left to write()
+    snapshot = {name: np.array(getattr(sim, name)) for name in PARAMS}
+    snapshot['game_state'] = np.array(sim.game_state.name)
+    snapshot['sprite'] = np.array(sim.sprite.name)
+    snapshot['time_warp'] = np.array(sim.time_warp.name)
+    snapshot['world_size'] = np.array((sim.window.world_width, sim.window.world_height), dtype=np.int64)
+    snapshot['is_auto'] = np.array(sim.is_auto)
+
+    # Telemetry of the generation still breeding, empty when nothing waits to be logged
+    snapshot['pending_record'] = np.array('' if sim.pending_record is None else
+                                          json.dumps(sim.pending_record, default=lambda value: value.item()))
+
+    snapshot.update(_agent_columns('agents', sim.agents))
+    snapshot.update(_agent_columns('prev_gen', sim.prev_gen or []))
+
+    foods = list(sim.foods)
+    snapshot['food_position'] = np.array([(food.position.x, food.position.y) for food in foods]).reshape(-1, 2)
+    snapshot['food_sprite'] = np.array([food.sprite_idx for food in foods], dtype=np.int64)
+
+    snapshot['condition'] = np.array(sim.cm.current.name)
+    snapshot['condition_direction'] = np.array(sim.cm.direction, dtype=np.float64)
+
+    snapshot['id_state'] = np.array(sim.idg.get_state(), dtype=np.int64)
+
+    for name in sim.pedigree.fields:
+        snapshot[f'pedigree_{name}'] = getattr(sim.pedigree, name)[:sim.pedigree.count].copy()
+
+    for stream, state in sim.rng.get_state().items():
+        snapshot[f'rng_{stream}_bit_generator'] = np.array(state['bit_generator'])
+        snapshot[f'rng_{stream}_block'] = state['block']
+        snapshot[f'rng_{stream}_index'] = np.array(state['index'])
+
+    return snapshot
+
+
+def write(snapshot: dict, path: str):
+    # Written next to the target and swapped in, a crash mid-write keeps the previous checkpoint
+    with open(path + '.tmp', 'wb') as file:
+        np.savez(file, **snapshot)
+    os.replace(path + '.tmp', path)
+
+
+def save(sim, path: str):
+    write(capture(sim), path)
+
+
+def world_size(path: str):
+    # Arena the checkpoint was saved in, None for checkpoints older than the camera
+    with np.load(path, allow_pickle=False) as data:
+        return tuple(data['world_size'].tolist()) if 'world_size' in data.files else None
+
+
+def load(sim, path: str):
+    with np.load(path, allow_pickle=False) as data:
+        snapshot = {name: data[name] for name in data.files}
+
+    # Positions, the world grid and the food grid are only valid in the arena they were saved in
+    saved_size = tuple(snapshot['world_size'].tolist()) if 'world_size' in snapshot else None
+    if saved_size is not None and saved_size != (sim.window.world_width, sim.window.world_height):
+        raise ValueError(f'Checkpoint was saved in a {saved_size[0]}x{saved_size[1]} world, '
+                         f'not {sim.window.world_width}x{sim.window.world_height}')
+
+    for name in PARAMS:
+        setattr(sim, name, snapshot[name].item())
+    sim.sprite = EntitySprite[str(snapshot['sprite'])]
+    sim.time_warp = TimeWarp[str(snapshot['time_warp'])]
+    sim.sim_accumulator = 0.0
+
+    # Screens mid-interaction restart at the choice of parents
+    sim.game_state = GameState[str(snapshot['game_state'])]
+    if sim.game_state == GameState.OFFSPRING_OVERVIEW:
+        sim.game_state = GameState.PARENTS_SELECTION
+    sim.ui_parent1, sim.ui_parent2 = None, None
+    sim.card_choices = None
+    sim.offsprings = []
+    sim.ui_agent_inspect = None
+    sim.is_auto = bool(snapshot['is_auto'])
+
+    pending_record = str(snapshot['pending_record'])
+    sim.pending_record = json.loads(pending_record) if pending_record else None
+
+    sim.cm.current = Condition[str(snapshot['condition'])]
+    sim.cm.direction = tuple(float(value) for value in snapshot['condition_direction'])
+
+    sim.idg.set_state(snapshot['id_state'].tolist())
+
+    sim.pedigree.restore({name: snapshot[f'pedigree_{name}'] for name in sim.pedigree.fields})
+
+    # World rows follow agent order, which is also the order agents eat in
+    if sim.world is not None:
+        sim.world.clear()
+    sim.agents = _restore_agents(sim, snapshot, 'agents', sim.world)
+    sim.prev_gen = _restore_agents(sim, snapshot, 'prev_gen', None)
+
+    sim.foods.clear()
+    sim.foods.spawn(snapshot['food_position'].astype(np.float64).reshape(-1, 2), snapshot['food_sprite'],
+                    lambda x, y, sprite_idx: Food(sim.context, Position(x, y), sprite_idx))
+    sim.last_eaten = []
+    sim.eaten_foods = []
+
+    # Last, rebuilding the entities above draws from the streams
+    sim.rng.set_state({stream: {'bit_generator': str(snapshot[f'rng_{stream}_bit_generator']),
+                                'block': snapshot[f'rng_{stream}_block'],
+                                'index': int(snapshot[f'rng_{stream}_index'])}
+                       for stream in sim.rng.streams})
+
+    sim.window.invalidate()
+
+
+class Autosave:
+    def __init__(self, path: str, every: int = 1):
+        self.path = path
+        self.every = every
+        self.thread = None
+
+    def __call__(self, sim):
+        if sim.generation % self.every != 0:
+            return
+
+        # A write still in flight makes this generation skip, the loop never waits on the disk
+        if self.thread is not None and self.thread.is_alive():
+            return
+
+        snapshot = capture(sim)
+        self.thread = threading.Thread(target=write, args=(snapshot, self.path), daemon=True)
+        self.thread.start()
+
+    def wait(self):
+        if self.thread is not None:
+            self.thread.join()
+
+
+def _agent_columns(prefix: str, agents: list):
+    columns = {f'{prefix}_{name}': np.array([getattr(agent, name) for agent in agents], dtype=dtype)
+               for name, dtype in AGENT_FIELDS.items()}
+    columns[f'{prefix}_sprite'] = np.array([agent.sprite.name for agent in agents], dtype=str)
+    columns[f'{prefix}_position'] = np.array([(agent.position.x, agent.position.y)
+                                              for agent in agents]).reshape(-1, 2)
+    columns[f'{prefix}_direction'] = np.array([agent.direction for agent in agents]).reshape(-1, 2)
+
+    return columns
+
+
+def _restore_agents(sim, snapshot: dict, prefix: str, world):
+    agents = []
+    for i in range(len(snapshot[f'{prefix}_id'])):
+        agent = Agent(sim.context, EntitySprite[str(snapshot[f'{prefix}_sprite'][i])],
+                      int(snapshot[f'{prefix}_id'][i]), int(snapshot[f'{prefix}_generation'][i]))
+
+        for name in AGENT_FIELDS:
+            setattr(agent, name, snapshot[f'{prefix}_{name}'][i].item())
+        agent.position = Position(*snapshot[f'{prefix}_position'][i].tolist())
+        agent.direction = tuple(snapshot[f'{prefix}_direction'][i].tolist())
+
+        if world is not None:
+            world.attach(agent)
+        agents.append(agent)
+
+    return agents
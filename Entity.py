@@ -1,25 +1,57 @@
 import math
 
+import numpy as np
 import pygame
 
-from App import Window, ConditionManager, SpriteLoader, EntitySprite, Condition
+from App import Window, ConditionManager, SpriteLoader, EntitySprite, Condition, fonts
+from Spatial import FoodGrid
 from Utils import Position
-import random
+from World import WorldState, WorldField, read_position, read_pair, read_scalar, read_count
+from Rng import SimulationRNG
 from typing import Optional
 
 
-class Entity:
-    def __init__(self, window: Window, sl: SpriteLoader, cm: ConditionManager):
+class EntityContext:
+    # Services shared by every entity of a simulation, held once instead of on each entity
+    __slots__ = ('window', 'sl', 'cm', 'rng')
+
+    def __init__(self, window: Window, sl: SpriteLoader, cm: ConditionManager, rng: SimulationRNG = None):
         self.window = window
         self.sl = sl
         self.cm = cm
+        self.rng = rng if rng is not None else SimulationRNG()
+
+
+class Entity:
+    __slots__ = ('context',)
+
+    def __init__(self, context: EntityContext):
+        self.context = context
+
+    @property
+    def window(self):
+        return self.context.window
+
+    @property
+    def sl(self):
+        return self.context.sl
+
+    @property
+    def cm(self):
+        return self.context.cm
+
+    @property
+    def rng(self):
+        return self.context.rng
 
 
 class MenuAgent(Entity):
-    def __init__(self, window: Window, sl: SpriteLoader, cm: ConditionManager, sprite: EntitySprite,
-                 sprite_scale: float, callback,
+    __slots__ = ('bound_min', 'bound_max', 'sprite_scale', 'position', 'speed', 'callback', 'font1', 'sprite',
+                 'current_frame', 'direction')
+
+    def __init__(self, context: EntityContext, sprite: EntitySprite, sprite_scale: float, callback,
                  bound: tuple[tuple[int, int], tuple[int, int]] = None):
-        super().__init__(window, sl, cm)
+        super().__init__(context)
 
         self.bound_min = (0, 0)
         self.bound_max = (self.window.width, self.window.height)
@@ -33,9 +65,9 @@ class MenuAgent(Entity):
         self.callback = callback
 
         # Sprite vars & font
-        self.font1 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 12)
+        self.font1 = fonts.get(12)
         self.sprite = sprite
-        self.current_frame = random.randint(0, self.sl.get_num_frame_in_entity_sprite(self.sprite) - 1)
+        self.current_frame = self.rng.visual.integers(0, self.sl.get_num_frame_in_entity_sprite(self.sprite))
 
         self._pick_direction()
 
@@ -56,12 +88,8 @@ class MenuAgent(Entity):
 
     def render(self, events):
         # Sprite orientation
-        current_sprite = self.sl.get_entity_sprite_at_frame(self.sprite, self.current_frame)
-        current_sprite = pygame.transform.scale(current_sprite,
-                                                (current_sprite.get_width() * self.sprite_scale,
-                                                 current_sprite.get_height() * self.sprite_scale))
-        if self.direction[0] < 0:
-            current_sprite = pygame.transform.flip(current_sprite, True, False)
+        current_sprite = self.sl.get_scaled_entity_sprite(self.sprite, self.current_frame, self.sprite_scale,
+                                                          self.direction[0] < 0)
 
         # Size for translation
         sprite_width, sprite_height = current_sprite.get_size()
@@ -92,20 +120,37 @@ class MenuAgent(Entity):
             self.current_frame = pygame.time.get_ticks() % self.sl.get_num_frame_in_entity_sprite(self.sprite)
 
     def _pick_direction(self):
-        angle = random.uniform(0, 2 * math.pi)
+        angle = self.rng.movement.uniform(0, 2 * math.pi)
         self.direction = (math.cos(angle), math.sin(angle))
 
 
 class Agent(Entity):
-    def __init__(self, window: Window, sl: SpriteLoader, cm: ConditionManager, sprite: EntitySprite, agent_id: int,
+    # Backed by a WorldState row while the agent is in a running world
+    position = WorldField(read_position)
+    direction = WorldField(read_pair)
+    speed = WorldField(read_scalar)
+    size = WorldField(read_scalar)
+    energy = WorldField(read_scalar)
+    eaten = WorldField(read_count)
+
+    # WorldField values live in the underscored slots while detached
+    __slots__ = ('world', 'row', 'bound_min', 'bound_max', 'id', 'generation', 'color', 'drawn_rect',
+                 'parent1_id', 'parent2_id', 'mutated', 'mutation_speed_offset', 'mutation_size_offset',
+                 'sprite', 'current_frame', 'sprite_scale',
+                 '_position', '_direction', '_speed', '_size', '_energy', '_eaten')
+
+    def __init__(self, context: EntityContext, sprite: EntitySprite, agent_id: int,
                  generation: int, speed: int = -1, size: int = -1,
                  bound: tuple[tuple[int, int], tuple[int, int]] = None,
-                 parent1: Optional["Agent"] = None, parent2: Optional["Agent"] = None):
-        super().__init__(window, sl, cm)
+                 parent1_id: int = -1, parent2_id: int = -1,
+                 world: Optional[WorldState] = None):
+        super().__init__(context)
+        self.world = None
+        self.row = -1
 
-        # Bound
+        # Bound, in world coordinates
         self.bound_min = (0, 0)
-        self.bound_max = (self.window.width, self.window.height)
+        self.bound_max = (self.window.world_width, self.window.world_height)
         if bound is not None:
             self.bound_min = bound[0]
             self.bound_max = bound[1]
@@ -117,7 +162,7 @@ class Agent(Entity):
 
         self.size = round(size, 2)
         if size < 1:
-            self.size = random.randint(20, 50)
+            self.size = self.rng.genetics.integers(20, 51)
 
         self.speed = round(speed, 2)
         if speed < 1:
@@ -127,40 +172,39 @@ class Agent(Entity):
         self.color = (0, 0, 255)
         self.eaten = 0
 
-        # Optionals
-        self.parent1 = parent1
-        self.parent2 = parent2
+        # Screen area covered by the last render
+        self.drawn_rect = None
+
+        # Optionals, ancestors are looked up by id in the PedigreeStore
+        self.parent1_id = parent1_id
+        self.parent2_id = parent2_id
         self.mutated = False
         self.mutation_speed_offset = 0.0
         self.mutation_size_offset = 0.0
 
         # Sprite vars
         self.sprite = sprite
-        self.current_frame = random.randint(0, self.sl.get_num_frame_in_entity_sprite(self.sprite) - 1)
+        self.current_frame = self.rng.visual.integers(0, self.sl.get_num_frame_in_entity_sprite(self.sprite))
 
         self.sprite_scale = self.size / 20
 
         self._pick_direction()
 
+        if world is not None:
+            world.attach(self)
+
     def change_sprite(self, sprite):
         self.sprite = sprite
 
-    def move(self, foods: list):
+    def move(self, foods: FoodGrid):
         if self.energy > 0:
             # Move
             if not len(foods) == 0:
-                closest_food = foods[0]
-                closest_dist = math.inf
-                for food in foods:
-                    dist = math.sqrt((self.position.x - food.position.x) ** 2 +
-                                     (self.position.y - food.position.y) ** 2)
-                    if dist < closest_dist:
-                        closest_food = food
-                        closest_dist = dist
-
-                direction_x = closest_food.position.x - self.position.x
-                direction_y = closest_food.position.y - self.position.y
-                distance_to_food = (direction_x ** 2 + direction_y ** 2) ** 0.5
+                # Food further than the agent's size never steers it
+                closest_food, distance_to_food = foods.nearest(self.position.x, self.position.y, self.size)
+                if closest_food is not None:
+                    direction_x = closest_food.position.x - self.position.x
+                    direction_y = closest_food.position.y - self.position.y
 
                 speed_modifier = 1
 
@@ -171,7 +215,7 @@ class Agent(Entity):
                     self.position.x += self.cm.direction[0] * 1.2
                     self.position.y += self.cm.direction[1] * 1.2
 
-                if distance_to_food <= self.size:
+                if closest_food is not None:
                     # Normalize direction and move towards it
                     self.position.x += self.speed * speed_modifier * (direction_x / distance_to_food)
                     self.position.y += self.speed * speed_modifier * (direction_y / distance_to_food)
@@ -199,51 +243,117 @@ class Agent(Entity):
         return False
 
     def render(self, events, callback):
+        sprite_blit, ring_blit = self.get_blits(events, callback)
+        return self.drawn(self.window.screen.blit(*sprite_blit).union(self.window.screen.blit(*ring_blit)))
+
+    def get_blits(self, events, callback):
+        camera = self.window.camera
+        x, y = camera.to_screen(self.position.x, self.position.y)
+
         # Sprite orientation
-        current_sprite = self.sl.get_entity_sprite_at_frame(self.sprite, self.current_frame)
-        current_sprite = pygame.transform.scale(current_sprite,
-                                                (current_sprite.get_width() * self.sprite_scale,
-                                                 current_sprite.get_height() * self.sprite_scale))
-        if self.direction[0] < 0:
-            current_sprite = pygame.transform.flip(current_sprite, True, False)
+        current_sprite = self.sl.get_scaled_entity_sprite(self.sprite, self.current_frame,
+                                                          self.sprite_scale * camera.zoom, self.direction[0] < 0)
 
         # Size for translation
         sprite_width, sprite_height = current_sprite.get_size()
 
-        # Check on click
+        # Check on click, in screen coordinates
         for event in events:
             if event.type == pygame.MOUSEBUTTONUP and not getattr(event, 'handled', False):
-                x, y = event.pos
-                if (self.position.x - (sprite_width / 2) <= x <= self.position.x + (sprite_width / 2)
-                        and self.position.y - (sprite_height / 2) <= y <= self.position.y + (sprite_height / 2)):
+                click_x, click_y = event.pos
+                if (x - (sprite_width / 2) <= click_x <= x + (sprite_width / 2)
+                        and y - (sprite_height / 2) <= click_y <= y + (sprite_height / 2)):
                     setattr(event, 'handled', True)
                     callback(self)
 
-        # Render
-        self.window.screen.blit(current_sprite, (self.position.x - (sprite_width / 2), self.position.y - (sprite_height / 2)))
-
-        circle_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(circle_surface, (180, 0, 0) + (int((self.energy / 100) * 255),),
-                           (self.size, self.size), self.size, width=2)
-        self.window.screen.blit(circle_surface, (self.position.x - self.size, self.position.y - self.size))
+        ring = self.sl.get_energy_ring(self.size * camera.zoom, self.energy)
+        ring_radius = ring.get_width() / 2
 
         # Clock tick
         if pygame.time.get_ticks() % 10 == 0:
             self.current_frame = pygame.time.get_ticks() % self.sl.get_num_frame_in_entity_sprite(self.sprite)
 
+        return ((current_sprite, (x - (sprite_width / 2), y - (sprite_height / 2))),
+                (ring, (x - ring_radius, y - ring_radius)))
+
+    def drawn(self, rect):
+        # Changed area is where the agent was plus where it is now
+        dirty = rect if self.drawn_rect is None else rect.union(self.drawn_rect)
+        self.drawn_rect = rect
+
+        return dirty
+
     def _pick_direction(self):
-        angle = random.uniform(0, 2 * math.pi)
+        angle = self.rng.movement.uniform(0, 2 * math.pi)
         self.direction = (math.cos(angle), math.sin(angle))
 
 
 class Food(Entity):
-    def __init__(self, window: Window, sl: SpriteLoader, cm: ConditionManager):
-        super().__init__(window, sl, cm)
-        self.size = 6
-        self.position = Position(random.randint(8, self.window.width - 8), random.randint(8, self.window.height - 58))
-        self.sprite_idx = sl.get_random_food_index()
+    size = 6
+
+    # Agents closer than this eat it
+    reach = size / 2
+
+    __slots__ = ('position', 'sprite_idx', 'slot', 'cell_slot')
+
+    def __init__(self, context: EntityContext, position: Position = None, sprite_idx: int = -1):
+        super().__init__(context)
+        self.position = position
+        if position is None:
+            self.position = Position(self.rng.food.integers(8, self.window.world_width - 7),
+                                     self.rng.food.integers(8, self.window.world_height - 57))
+
+        self.sprite_idx = sprite_idx
+        if sprite_idx < 0:
+            self.sprite_idx = self.sl.get_random_food_index(self.rng.food)
+
+        # Bookkeeping for FoodGrid
+        self.slot = -1
+        self.cell_slot = -1
 
     def render(self):
-        sprite = self.sl.get_food_sprite(self.sprite_idx)
+        sprite = self.sl.get_scaled_food_sprite(self.sprite_idx, self.window.camera.zoom)
         sprite_width, sprite_height = sprite.get_size()
-        self.window.screen.blit(sprite, (self.position.x - (sprite_width // 2), self.position.y - (sprite_height // 2)))
+        x, y = self.window.camera.to_screen(self.position.x, self.position.y)
+        return self.window.screen.blit(sprite, (x - (sprite_width // 2), y - (sprite_height // 2)))
+
+    def get_rect(self):
+        # Screen area of the food under the current camera
+        sprite_width, sprite_height = self.sl.get_scaled_food_sprite(self.sprite_idx,
+                                                                     self.window.camera.zoom).get_size()
+        x, y = self.window.camera.to_screen(self.position.x, self.position.y)
+        return pygame.Rect(x - (sprite_width // 2), y - (sprite_height // 2), sprite_width, sprite_height)
+
+
+def spawn_food(context: EntityContext, foods: FoodGrid, count: int):
+    # Positions and sprites of the whole batch come from one draw each, eaten food is recycled by the grid
+    rng = context.rng.food.generator
+    positions = np.column_stack((rng.integers(8, context.window.world_width - 7, count),
+                                 rng.integers(8, context.window.world_height - 57, count)))
+    sprite_idx = rng.integers(0, context.sl.get_num_food_sprites(), count)
+
+    return foods.spawn(positions, sprite_idx, lambda x, y, sprite: Food(context, Position(x, y), sprite))
+
+
+def visible_agents(window: Window, agents: list, world: Optional[WorldState], margin: float = 100):
+    # Agents whose position lies within margin (world units, covers sprite and ring) of the camera view.
+    # Agents move every tick, so an index over them would be rebuilt every frame; one bounds test over
+    # all of them costs no more than that rebuild
+    left, top, right, bottom = window.camera.view_rect
+    if world is not None:
+        return [world.agents[row] for row in world.within(left - margin, top - margin,
+                                                          right + margin, bottom + margin)]
+
+    return [agent for agent in agents
+            if left - margin <= agent.position.x <= right + margin and top - margin <= agent.position.y <= bottom + margin]
+
+
+def render_agents(window: Window, agents: list, events, callback):
+    # Every sprite and energy ring goes out in a single blits call, in the same order as per-agent rendering
+    batch = []
+    for agent in agents:
+        batch.extend(agent.get_blits(events, callback))
+
+    rects = window.screen.blits(batch)
+    for i, agent in enumerate(agents):
+        window.mark_dirty(agent.drawn(rects[2 * i].union(rects[2 * i + 1])))
@@ -0,0 +1,104 @@
+import os
+import csv
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Headless import run_headless
+
+# Simulation parameters a sweep may vary, the same knobs as the main menu
+SWEEP_PARAMS = ('initial_population', 'initial_food_amount', 'mutation_chance', 'mutation_strength')
+
+METRICS = ('population', 'mean_speed', 'mean_size', 'food_eaten', 'survivors', 'offspring')
+
+
+def run_trial(trial: dict):
+    params = {name: trial[name] for name in SWEEP_PARAMS if name in trial}
+
+    # The trial owns its generator, nothing global is shared between worker processes
+    rows = []
+    for record in run_headless(trial['generations'], seed=trial['seed'], **params):
+        rows.append({**params, 'seed': trial['seed'], **record})
+
+    return rows
+
+
+def make_trials(grid: dict, seeds, generations: int):
+    for name in grid:
+        if name not in SWEEP_PARAMS:
+            raise ValueError(f'Cannot sweep over {name}, expected one of {SWEEP_PARAMS}')
+
+    names = list(grid)
+    trials = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        for seed in seeds:
+            trials.append({**dict(zip(names, values)), 'seed': seed, 'generations': generations})
+
+    return trials
+
+
+def run_sweep(grid: dict, seeds=(0,), generations: int = 20, workers: int = None):
+    trials = make_trials(grid, seeds, generations)
+
+    # Each trial is an independent seeded headless run, one per process
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        results = pool.map(run_trial, trials)
+
+    return [row for rows in results for row in rows]
+
+
+def aggregate(rows: list):
+    # One row per parameter set and generation, metrics averaged over seeds
+    groups = {}
+    for row in rows:
+        key = tuple(row.get(name) for name in SWEEP_PARAMS) + (row['generation'],)
+        groups.setdefault(key, []).append(row)
+
+    table = []
+    for key, members in sorted(groups.items(), key=lambda item: [(k is None, k or 0) for k in item[0]]):
+        entry = dict(zip(SWEEP_PARAMS + ('generation',), key))
+        entry['runs'] = len(members)
+
+        for metric in METRICS:
+            values = np.array([member[metric] for member in members], dtype=float)
+            entry[f'{metric}_mean'] = float(values.mean())
+            entry[f'{metric}_std'] = float(values.std())
+
+        conditions = [member['condition'] for member in members]
+        entry['condition'] = max(set(conditions), key=conditions.count)
+
+        table.append(entry)
+
+    return table
+
+
+def write_table(table: list, path: str):
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(table[0].keys()) if table else [])
+        writer.writeheader()
+        writer.writerows(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run a parameter sweep of headless simulations across CPU cores')
+    parser.add_argument('--population', type=int, nargs='+', default=[10])
+    parser.add_argument('--food', type=int, nargs='+', default=[100])
+    parser.add_argument('--mutation-chance', type=float, nargs='+', default=[0.1])
+    parser.add_argument('--mutation-strength', type=float, nargs='+', default=[0.5])
+    parser.add_argument('--seeds', type=int, default=4, help='Number of seeded runs per parameter set')
+    parser.add_argument('--generations', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--raw', action='store_true', help='Write every run instead of the aggregated table')
+    parser.add_argument('--out', default='experiment.csv')
+    args = parser.parse_args()
+
+    sweep = run_sweep({'initial_population': args.population,
+                       'initial_food_amount': args.food,
+                       'mutation_chance': args.mutation_chance,
+                       'mutation_strength': args.mutation_strength},
+                      seeds=range(args.seeds), generations=args.generations, workers=args.workers)
+
+    write_table(sweep if args.raw else aggregate(sweep), args.out)
+    print(f'{len(sweep)} generation records written to {args.out}')
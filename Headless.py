@@ -0,0 +1,125 @@
+import os
+import sys
+import json
+import argparse
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from App import HeadlessSpriteLoader, HeadlessWindow, IDGenerator, ConditionManager, GameState
+from main import Simulation
+import Checkpoint
+from Checkpoint import Autosave
+from Telemetry import TelemetryLog
+from Rng import SimulationRNG
+
+
+class HeadlessSimulation(Simulation):
+    def __init__(self, vectorized: bool = True, resume: str = None, seed: int = None, **params):
+        self.rng = SimulationRNG(seed)
+
+        # Backend services, no pygame display, fonts or sprites
+        self.sl = HeadlessSpriteLoader()
+        self.idg = IDGenerator(self.rng.ids)
+        self.cm = ConditionManager(self.rng.conditions)
+        self.window = HeadlessWindow()
+
+        self.setup(vectorized)
+
+        for name, value in params.items():
+            if not hasattr(self, name):
+                raise AttributeError(f'Unknown simulation parameter: {name}')
+            setattr(self, name, value)
+
+        self.reset()
+        self.game_state = GameState.SIM_RUNNING
+
+        if resume is not None:
+            Checkpoint.load(self, resume)
+
+    def run(self, generations: int):
+        stats = []
+        while len(stats) < generations:
+            stats.append(self.run_generation())
+
+            if self.game_state == GameState.GAME_END_EVAL:
+                break
+
+        return stats
+
+    def run_generation(self):
+        population = len(self.agents)
+        food = len(self.foods)
+        condition = self.cm.current
+
+        ticks = 0
+        while not self.step_simulation():
+            ticks += 1
+
+        speeds = [agent.speed for agent in self.agents]
+        sizes = [agent.size for agent in self.agents]
+        eaten = sum(agent.eaten for agent in self.agents)
+
+        self.generation += 1
+        self.generation_eval()
+        survivors = len(self.prev_gen)
+
+        # Fewer than two survivors is extinction, same rule as GAME_END_EVAL
+        if survivors >= 2:
+            # Auto mode breeds every survivor pair in one batch, the next pass replenishes food
+            self.is_auto = True
+            while self.is_auto:
+                self.next_generation([])
+
+        return {
+            'generation': self.generation,
+            'condition': condition.label,
+            'population': population,
+            'food': food,
+            'food_eaten': eaten,
+            'ticks': ticks,
+            'mean_speed': sum(speeds) / population if population else 0.0,
+            'mean_size': sum(sizes) / population if population else 0.0,
+            'survivors': survivors,
+            'offspring': len(self.agents),
+        }
+
+
+def run_headless(generations: int, vectorized: bool = True, resume: str = None, seed: int = None, **params):
+    return HeadlessSimulation(vectorized, resume, seed, **params).run(generations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run the simulation without a display')
+    parser.add_argument('--generations', type=int, default=10)
+    parser.add_argument('--population', type=int, default=10)
+    parser.add_argument('--food', type=int, default=100)
+    parser.add_argument('--mutation-chance', type=float, default=0.1)
+    parser.add_argument('--mutation-strength', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=None, help='Seed for a reproducible run')
+    parser.add_argument('--resume', default=None, help='Checkpoint file to continue from')
+    parser.add_argument('--autosave', default=None, help='Checkpoint file written in the background')
+    parser.add_argument('--autosave-every', type=int, default=1, help='Generations between autosaves')
+    parser.add_argument('--telemetry', default=None, help='File receiving one record per generation')
+    parser.add_argument('--telemetry-format', choices=('csv', 'jsonl', 'arrow'), default=None,
+                        help='Defaults to the telemetry file extension')
+    args = parser.parse_args()
+
+    autosave = Autosave(args.autosave, args.autosave_every) if args.autosave else None
+    telemetry = TelemetryLog(args.telemetry, args.telemetry_format) if args.telemetry else None
+    for record in run_headless(args.generations,
+                               resume=args.resume,
+                               seed=args.seed,
+                               initial_population=args.population,
+                               initial_food_amount=args.food,
+                               mutation_chance=args.mutation_chance,
+                               mutation_strength=args.mutation_strength,
+                               autosave=autosave,
+                               telemetry=telemetry):
+        json.dump(record, sys.stdout)
+        sys.stdout.write('\n')
+
+    if autosave is not None:
+        autosave.wait()
+
+    if telemetry is not None:
+        telemetry.close()
@@ -0,0 +1,157 @@
+import os
+import argparse
+import multiprocessing
+
+import numpy as np
+
+from App import Condition, GameState
+from Entity import Agent
+from Headless import HeadlessSimulation
+from Experiment import write_table
+
+# Trait and lineage columns of a migrant, plain numbers so nothing pygame-backed crosses a process boundary
+MIGRANT_FIELDS = ('island', 'id', 'generation', 'speed', 'size', 'eaten')
+
+
+class IslandSimulation(HeadlessSimulation):
+    def __init__(self, island: int, seed=None, condition_probability: list = None, **params):
+        super().__init__(seed=seed, **params)
+        self.island = island
+
+        # Each island can weather its own climate
+        if condition_probability is not None:
+            self.cm.probabilities = condition_probability
+
+        # Agents of the last finished generation, with what they ate, the pool emigrants are picked from
+        self.last_lived = []
+
+    def generation_eval(self):
+        self.last_lived = list(self.agents)
+        super().generation_eval()
+
+    def emigrants(self, fraction: float):
+        # The best eaters of the last generation, at least one while anyone lived
+        if not self.last_lived:
+            return []
+
+        count = max(1, int(len(self.last_lived) * fraction))
+        best = sorted(self.last_lived, key=lambda agent: -agent.eaten)[:count]
+
+        # Each generation sends its migrants once, an extinct island has nobody left to send
+        self.last_lived = []
+        return [{'island': self.island, 'id': agent.id, 'generation': agent.generation, 'speed': agent.speed,
+                 'size': agent.size, 'eaten': agent.eaten} for agent in best]
+
+    def immigrate(self, migrants: list):
+        # Migrants join the generation about to run as fresh agents, their origin stays in the coordinator's log
+        arrivals = [Agent(self.context, self.sprite, self.idg(), self.generation,
+                          speed=migrant['speed'], size=migrant['size'], world=self.world) for migrant in migrants]
+        self.agents.extend(arrivals)
+
+        # Enough arrivals recolonise an island that went extinct, with food replenished as after any breeding
+        if self.game_state == GameState.GAME_END_EVAL and len(self.agents) >= 2:
+            self.replenish_food()
+            self.game_state = GameState.SIM_RUNNING
+
+
+def island_worker(connection, island: int, seed, params: dict):
+    sim = IslandSimulation(island, seed, **params)
+
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+
+        generations, migrants, fraction = message
+        sim.immigrate(migrants)
+        records = [{'island': island, **record} for record in sim.run(generations)] if len(sim.agents) >= 2 else []
+        connection.send((records, sim.emigrants(fraction)))
+
+    connection.close()
+
+
+def run_islands(islands: list, epochs: int, migration_interval: int = 5, migration_fraction: float = 0.1,
+                seed: int = None):
+    # One worker process per island, migrants travel around a ring every migration_interval generations
+    seeds = np.random.SeedSequence(seed).spawn(len(islands))
+
+    workers = []
+    for island, (params, island_seed) in enumerate(zip(islands, seeds)):
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=island_worker, args=(child, island, island_seed, params),
+                                          daemon=True)
+        process.start()
+        workers.append((process, parent))
+
+    records, migrations = [], []
+    inbound = [[] for _ in islands]
+    try:
+        for epoch in range(epochs):
+            for (_, connection), migrants in zip(workers, inbound):
+                connection.send((migration_interval, migrants, migration_fraction))
+
+            inbound = [[] for _ in islands]
+            for island, (_, connection) in enumerate(workers):
+                island_records, emigrants = connection.recv()
+                records.extend({'epoch': epoch, **record} for record in island_records)
+
+                destination = (island + 1) % len(islands)
+                inbound[destination] = emigrants
+                migrations.extend({'epoch': epoch, 'to': destination, **migrant} for migrant in emigrants)
+    finally:
+        for process, connection in workers:
+            connection.send(None)
+            process.join()
+
+    return records, migrations
+
+
+def summarise(records: list):
+    # Latest generation reached and mean traits of its population, per island
+    latest = {}
+    for record in records:
+        if record['island'] not in latest or record['generation'] >= latest[record['island']]['generation']:
+            latest[record['island']] = record
+
+    return [latest[island] for island in sorted(latest)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Evolve one population split over islands in worker processes')
+    parser.add_argument('--islands', type=int, default=os.cpu_count())
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--migration-interval', type=int, default=5, help='Generations between migrations')
+    parser.add_argument('--migration-fraction', type=float, default=0.1, help='Share of best eaters that migrate')
+    parser.add_argument('--population', type=int, default=10)
+    parser.add_argument('--food', type=int, nargs='+', default=[100], help='Initial food, cycled over islands')
+    parser.add_argument('--climate', choices=['default'] + [condition.name.lower() for condition in Condition],
+                        nargs='+', default=['default'],
+                        help='Condition each island favours, cycled over islands')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--out', default='islands.csv')
+    parser.add_argument('--migrations-out', default=None, help='Also write every migrant record')
+    args = parser.parse_args()
+
+    islands = []
+    for i in range(args.islands):
+        params = {'initial_population': args.population, 'initial_food_amount': args.food[i % len(args.food)]}
+
+        # A favoured condition takes half of the chance, the rest keeps the usual weights
+        climate = args.climate[i % len(args.climate)]
+        if climate != 'default':
+            favoured = list(Condition).index(Condition[climate.upper()])
+            params['condition_probability'] = [p / 2 + (0.5 if j == favoured else 0)
+                                               for j, p in enumerate(Condition.get_probability())]
+        islands.append(params)
+
+    records, migrations = run_islands(islands, args.epochs, args.migration_interval, args.migration_fraction,
+                                      args.seed)
+
+    write_table(records, args.out)
+    if args.migrations_out is not None:
+        write_table(migrations, args.migrations_out)
+
+    for summary in summarise(records):
+        print(f"island {summary['island']}: generation {summary['generation']}, "
+              f"population {summary['population']}, mean speed {summary['mean_speed']:.2f}, "
+              f"mean size {summary['mean_size']:.2f}")
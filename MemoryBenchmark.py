@@ -0,0 +1,49 @@
+import os
+import gc
+import json
+import argparse
+import tracemalloc
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from App import HeadlessSpriteLoader, HeadlessWindow, ConditionManager, EntitySprite
+from Entity import EntityContext, Agent, Food
+from Utils import Position
+from World import WorldState
+
+
+def bytes_per_entity(build, count: int):
+    # Traced allocation growth while count entities are alive, the holding list excluded
+    entities = [None] * count
+    gc.collect()
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        entities[i] = build(i)
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    return used / count
+
+
+def run_benchmark(count: int):
+    window = HeadlessWindow()
+    context = EntityContext(window, HeadlessSpriteLoader(), ConditionManager())
+    world = WorldState((0, 0), (window.width, window.height), capacity=count)
+
+    return {
+        'count': count,
+        'position': bytes_per_entity(lambda i: Position(i, i), count),
+        'food': bytes_per_entity(lambda i: Food(context), count),
+        'agent': bytes_per_entity(lambda i: Agent(context, EntitySprite.CHICKEN, i, 0), count),
+        'agent_in_world': bytes_per_entity(lambda i: Agent(context, EntitySprite.CHICKEN, i, 0, world=world), count),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure traced bytes per Position, Food and Agent')
+    parser.add_argument('--count', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.count), indent=2))
@@ -0,0 +1,138 @@
+import numpy as np
+
+from App import EntitySprite
+
+
+class PedigreeRecord:
+    # Snapshot of a stored agent with the attributes the agent cards read
+    def __init__(self, store: "PedigreeStore", row: int):
+        self.id = int(store.id[row])
+        self.generation = int(store.generation[row])
+        self.parent1_id, self.parent2_id = (int(parent) for parent in store.parents[row])
+        self.sprite = store.sprites[store.sprite[row]]
+        self.speed = float(store.speed[row])
+        self.size = float(store.size[row])
+        self.eaten = int(store.eaten[row])
+        self.mutated = bool(store.mutated[row])
+        self.mutation_speed_offset, self.mutation_size_offset = (float(offset) for offset in store.mutation[row])
+
+
+class PedigreeStore:
+    fields = ('id', 'generation', 'parents', 'sprite', 'speed', 'size', 'eaten', 'mutated', 'mutation')
+
+    def __init__(self, capacity: int = 256):
+        self.sprites = list(EntitySprite)
+
+        # Append-only, one row per agent that finished a generation, looked up by id
+        self.count = 0
+        self.rows = {}
+
+        self.id = np.zeros(capacity, dtype=np.int64)
+        self.generation = np.zeros(capacity, dtype=np.int32)
+        self.parents = np.full((capacity, 2), -1, dtype=np.int64)
+        self.sprite = np.zeros(capacity, dtype=np.int8)
+        self.speed = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.eaten = np.zeros(capacity, dtype=np.int32)
+        self.mutated = np.zeros(capacity, dtype=bool)
+        self.mutation = np.zeros((capacity, 2))
+
+        # Rows sorted by parent id for descendant queries, rebuilt after appends
+        self.child_index = None
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, agent_id: int):
+        return agent_id in self.rows
+
+    def add(self, agent):
+        if self.count == len(self.id):
+            self._grow(2 * len(self.id))
+
+        row = self.count
+        self.id[row] = agent.id
+        self.generation[row] = agent.generation
+        self.parents[row] = (agent.parent1_id, agent.parent2_id)
+        self.sprite[row] = self.sprites.index(agent.sprite)
+        self.speed[row] = agent.speed
+        self.size[row] = agent.size
+        self.eaten[row] = agent.eaten
+        self.mutated[row] = agent.mutated
+        self.mutation[row] = (agent.mutation_speed_offset, agent.mutation_size_offset)
+
+        self.rows[agent.id] = row
+        self.count += 1
+        self.child_index = None
+
+        return row
+
+    def extend(self, agents):
+        for agent in agents:
+            self.add(agent)
+
+    def get(self, agent_id: int):
+        row = self.rows.get(agent_id)
+        if row is None:
+            return None
+
+        return PedigreeRecord(self, row)
+
+    def ancestors(self, agent_id: int, depth: int = -1):
+        # Ids of every recorded ancestor, up to depth generations back (-1 for all)
+        found = []
+        frontier = self._rows_of([agent_id])
+        while len(frontier) > 0 and depth != 0:
+            parents = np.unique(self.parents[frontier].ravel())
+            frontier = self._rows_of(parents[parents >= 0])
+            found.append(self.id[frontier])
+            depth -= 1
+
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    def descendants(self, agent_id: int, depth: int = -1):
+        # Ids of every recorded descendant, up to depth generations forward (-1 for all)
+        if self.child_index is None:
+            flat = self.parents[:self.count].ravel()
+            order = np.argsort(flat, kind='stable')
+            self.child_index = (flat[order], order // 2)
+
+        parent_ids, child_rows = self.child_index
+
+        found = []
+        frontier = np.array([agent_id], dtype=np.int64)
+        while len(frontier) > 0 and depth != 0:
+            starts = np.searchsorted(parent_ids, frontier, side='left')
+            ends = np.searchsorted(parent_ids, frontier, side='right')
+            rows = np.concatenate([child_rows[start:end] for start, end in zip(starts, ends)])
+            frontier = np.unique(self.id[rows])
+            found.append(frontier)
+            depth -= 1
+
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    def restore(self, columns: dict):
+        # Columns as saved by a checkpoint, one entry per field
+        count = len(columns['id'])
+        self._grow(max(256, count))
+        for name in self.fields:
+            getattr(self, name)[:count] = columns[name]
+
+        self.count = count
+        self.rows = {int(agent_id): row for row, agent_id in enumerate(self.id[:count])}
+        self.child_index = None
+
+    def clear(self):
+        self.count = 0
+        self.rows = {}
+        self.child_index = None
+
+    def _rows_of(self, agent_ids):
+        return np.array([self.rows[agent_id] for agent_id in agent_ids if agent_id in self.rows], dtype=np.int64)
+
+    def _grow(self, capacity: int):
+        for name in self.fields:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:min(len(old), capacity)] = old[:capacity]
+            setattr(self, name, new)
@@ -0,0 +1,121 @@
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+
+class _Scope:
+    __slots__ = ('profiler', 'name', 'begin')
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.begin = 0.0
+
+    def __enter__(self):
+        self.begin = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.begin, time.perf_counter())
+
+
+class _NoScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+# Handed out for every phase while the profiler is off, so a disabled timer is one call and one branch
+NO_SCOPE = _NoScope()
+
+
+class FrameProfiler:
+    def __init__(self, history: int = 240, max_trace_events: int = 200000):
+        self.enabled = False
+        self.tracing = False
+        self.show_hud = False
+
+        # Per-phase seconds of the frame in progress, a phase timed several times in a frame (substeps) adds up
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+        # Per-phase seconds of the last history frames, for the rolling percentiles
+        self.history = history
+        self.frames = {}
+
+        # Chrome trace events, the oldest dropped past max_trace_events
+        self.origin = time.perf_counter()
+        self.trace = deque(maxlen=max_trace_events)
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return NO_SCOPE
+
+        return _Scope(self, name)
+
+    def record(self, name: str, begin: float, end: float):
+        self.current[name] = self.current.get(name, 0.0) + end - begin
+
+        if self.tracing:
+            self.trace.append((name, begin, end))
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+        if not enabled:
+            self.frames = {}
+
+    def toggle_hud(self):
+        # Timing stays on while a trace is being recorded, only the overlay goes away
+        self.show_hud = not self.show_hud
+        self.set_enabled(self.show_hud or self.tracing)
+
+    def start_trace(self):
+        self.set_enabled(True)
+        self.tracing = True
+
+    def end_frame(self):
+        # Called once per presented frame, see Window.tick
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        self.current['frame'] = now - self.frame_start
+        if self.tracing:
+            self.trace.append(('frame', self.frame_start, now))
+
+        # A phase missing from this frame counts as zero so every history lines up with the frame count
+        for name in self.current.keys() | self.frames.keys():
+            if name not in self.frames:
+                self.frames[name] = deque(maxlen=self.history)
+            self.frames[name].append(self.current.get(name, 0.0))
+
+        self.current = {}
+        self.frame_start = now
+
+    def percentiles(self, quantiles=(50, 95, 99)):
+        # {phase: (p50, p95, p99)} in milliseconds, slowest phase first
+        stats = {name: tuple(np.percentile(np.fromiter(samples, float), quantiles) * 1000)
+                 for name, samples in self.frames.items() if samples}
+
+        return dict(sorted(stats.items(), key=lambda item: -item[1][0]))
+
+    def export_trace(self, path: str):
+        # Chrome trace-event format, open in chrome://tracing or Perfetto
+        events = [{'name': name, 'cat': 'frame' if name == 'frame' else 'phase', 'ph': 'X',
+                   'ts': (begin - self.origin) * 1e6, 'dur': (end - begin) * 1e6, 'pid': 0, 'tid': 0}
+                  for name, begin, end in self.trace]
+
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+
+# Process-wide, the window and the simulation time into the same frames
+profiler = FrameProfiler()
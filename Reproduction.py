@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class Brood:
+    # One generation's children as arrays, child i descends from survivors parent1[i] and parent2[i]
+    def __init__(self, parent1: np.ndarray, parent2: np.ndarray, speed: np.ndarray, size: np.ndarray,
+                 mutated: np.ndarray, speed_offset: np.ndarray, size_offset: np.ndarray):
+        self.parent1 = parent1
+        self.parent2 = parent2
+        self.speed = speed
+        self.size = size
+        self.mutated = mutated
+        self.speed_offset = speed_offset
+        self.size_offset = size_offset
+
+    def __len__(self):
+        return len(self.parent1)
+
+
+def offspring_counts(fitness: np.ndarray, max_offspring: int, rng: np.random.Generator):
+    # Simulation.child_policy_distribution for every pair at once, one count drawn per pair
+    child_choices = np.linspace(1, max_offspring, max_offspring, dtype=int)
+
+    distances = np.abs(child_choices[None, :] - fitness[:, None] / (max_offspring + 1))
+    weights = np.exp(-distances)
+    cumulative = np.cumsum(weights / weights.sum(axis=1, keepdims=True), axis=1)
+
+    picks = (cumulative < rng.random(len(fitness))[:, None]).sum(axis=1)
+    return child_choices[np.minimum(picks, max_offspring - 1)]
+
+
+def breed(eaten: np.ndarray, speed: np.ndarray, size: np.ndarray, rng: np.random.Generator,
+          mutation_chance: float, mutation_strength: float, max_offspring: int):
+    # Survivors are paired off at random, each agent breeds at most once and an odd one out does not
+    order = rng.permutation(len(eaten))
+    pairs = len(order) // 2
+    first, second = order[0:2 * pairs:2], order[1:2 * pairs:2]
+
+    counts = offspring_counts(eaten[first] + eaten[second], max_offspring, rng)
+    parent1, parent2 = np.repeat(first, counts), np.repeat(second, counts)
+    children = len(parent1)
+
+    # Blend crossover, one alpha per child
+    alpha = rng.uniform(0.3, 0.7, children)
+    child_speed = alpha * speed[parent1] + (1 - alpha) * speed[parent2]
+    child_size = alpha * size[parent1] + (1 - alpha) * size[parent2]
+
+    mutated = rng.random(children) < mutation_chance
+    speed_offset = np.where(mutated, np.round(rng.uniform(-mutation_strength, mutation_strength, children), 2), 0.0)
+    size_offset = np.where(mutated, np.round(rng.uniform(-mutation_strength, mutation_strength, children), 2), 0.0)
+
+    return Brood(parent1, parent2, child_speed, child_size, mutated, speed_offset, size_offset)
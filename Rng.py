@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+
+
+class BatchedStream:
+    # One independent numpy Generator, scalar draws are served from a block of uniforms drawn at once
+    def __init__(self, generator: np.random.Generator, batch: int = 1024):
+        self.generator = generator
+        self.batch = batch
+        self.block = np.empty(0)
+        self.index = 0
+
+    def random(self):
+        if self.index == len(self.block):
+            self.block = self.generator.random(self.batch)
+            self.index = 0
+
+        value = self.block[self.index]
+        self.index += 1
+        return float(value)
+
+    def uniform(self, low: float, high: float):
+        return low + (high - low) * self.random()
+
+    def integers(self, low: int, high: int):
+        # In [low, high), like Generator.integers
+        return low + min(int(self.random() * (high - low)), high - low - 1)
+
+    def index_of(self, probabilities):
+        # Index drawn with the given weights, which sum to 1
+        return min(int(np.searchsorted(np.cumsum(probabilities), self.random(), side='right')),
+                   len(probabilities) - 1)
+
+    def get_state(self):
+        return {'bit_generator': json.dumps(self.generator.bit_generator.state),
+                'block': self.block.copy(), 'index': self.index}
+
+    def set_state(self, state: dict):
+        self.generator.bit_generator.state = json.loads(state['bit_generator'])
+        self.block = np.array(state['block'], dtype=np.float64)
+        self.index = int(state['index'])
+
+
+class SimulationRNG:
+    # Every subsystem draws from its own child stream, so one seed reproduces a whole run
+    streams = ('movement', 'food', 'genetics', 'conditions', 'tiles', 'ids', 'visual')
+
+    def __init__(self, seed=None):
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+        for name, child in zip(self.streams, self.seed_sequence.spawn(len(self.streams))):
+            setattr(self, name, BatchedStream(np.random.default_rng(child)))
+
+    @property
+    def seed(self):
+        return self.seed_sequence.entropy
+
+    def spawn(self, count: int):
+        # Independent generators for parallel runs, no state shared with this one or each other
+        return [SimulationRNG(child) for child in self.seed_sequence.spawn(count)]
+
+    def get_state(self):
+        return {name: getattr(self, name).get_state() for name in self.streams}
+
+    def set_state(self, state: dict):
+        for name in self.streams:
+            getattr(self, name).set_state(state[name])
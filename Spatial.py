@@ -0,0 +1,283 @@
+import math
+
+import numpy as np
+
+
+class FoodGrid:
+    def __init__(self, width: int, height: int, cell_size: int = 50):
+        self.cell_size = cell_size
+        self.cols = width // cell_size + 1
+        self.rows = height // cell_size + 1
+
+        # Every food lives in items and in one cell. Removal tombstones its item slot, which keeps
+        # the draw order of the remaining food stable, and swap-pops it from its cell
+        self.items = []
+        self.dead = 0
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+
+        # Per-cell position arrays for batched queries, rebuilt only for cells that changed
+        self.cell_positions = [None] * len(self.cells)
+
+        # Removed food waiting to be respawned, see spawn()
+        self.pool = []
+
+    def __len__(self):
+        return len(self.items) - self.dead
+
+    def __iter__(self):
+        return (food for food in self.items if food is not None)
+
+    def remove(self, food):
+        self.items[food.slot] = None
+        self.dead += 1
+
+        cell = self._cell_at(food.position.x, food.position.y)
+        bucket = self.cells[cell]
+        last = bucket.pop()
+        if last is not food:
+            bucket[food.cell_slot] = last
+            last.cell_slot = food.cell_slot
+        self.cell_positions[cell] = None
+
+        food.slot, food.cell_slot = -1, -1
+        self.pool.append(food)
+
+        # Compacting once half the slots are dead keeps removal amortised O(1)
+        if self.dead > len(self.items) // 2:
+            self.items = [item for item in self.items if item is not None]
+            for slot, item in enumerate(self.items):
+                item.slot = slot
+            self.dead = 0
+
+    def clear(self):
+        for food in self:
+            food.slot, food.cell_slot = -1, -1
+            self.pool.append(food)
+
+        self._empty()
+
+    def cull(self, keep: int, rng: np.random.Generator):
+        # Randomly keep only keep food, chosen in one draw, the rest goes back to the pool
+        foods = list(self)
+        if keep >= len(foods):
+            return
+
+        kept = np.zeros(len(foods), dtype=bool)
+        kept[rng.choice(len(foods), keep, replace=False)] = True
+
+        self._empty()
+        survivors = []
+        for food, is_kept in zip(foods, kept):
+            if is_kept:
+                survivors.append(food)
+            else:
+                food.slot, food.cell_slot = -1, -1
+                self.pool.append(food)
+
+        positions = np.array([(food.position.x, food.position.y) for food in survivors], dtype=float)
+        self._insert_many(survivors, self._cells_of(positions.reshape(-1, 2)))
+
+    def spawn(self, positions: np.ndarray, sprite_idx: np.ndarray, make):
+        # A whole batch at once, pooled food is reused before make(x, y, sprite_idx) builds new ones
+        foods = []
+        for (x, y), sprite in zip(positions.tolist(), sprite_idx.tolist()):
+            if self.pool:
+                food = self.pool.pop()
+                food.position.x, food.position.y = x, y
+                food.sprite_idx = sprite
+            else:
+                food = make(x, y, sprite)
+            foods.append(food)
+
+        self._insert_many(foods, self._cells_of(positions))
+        return foods
+
+    def nearest(self, x: float, y: float, max_dist: float = math.inf):
+        closest_food = None
+        closest_dist = math.inf
+
+        col, row = self._col_row(x, y)
+        max_ring = max(self.cols, self.rows)
+        if max_dist != math.inf:
+            max_ring = min(max_ring, int(max_dist // self.cell_size) + 1)
+
+        for ring in range(max_ring + 1):
+            for cell in self._ring(col, row, ring):
+                for food in self.cells[cell]:
+                    dist = math.sqrt((x - food.position.x) ** 2 + (y - food.position.y) ** 2)
+                    if dist < closest_dist:
+                        closest_food = food
+                        closest_dist = dist
+
+            # Nothing further out can beat what was found
+            if closest_dist <= ring * self.cell_size:
+                break
+
+        if closest_dist > max_dist:
+            return None, math.inf
+
+        return closest_food, closest_dist
+
+    def within(self, x: float, y: float, radius: float):
+        found = []
+
+        col, row = self._col_row(x, y)
+        reach = int(radius // self.cell_size) + 1
+        for ring in range(reach + 1):
+            for cell in self._ring(col, row, ring):
+                for food in self.cells[cell]:
+                    if (x - food.position.x) ** 2 + (y - food.position.y) ** 2 <= radius ** 2:
+                        found.append(food)
+
+        return found
+
+    def within_rect(self, left: float, top: float, right: float, bottom: float):
+        # Food inside the rectangle, only the cells it overlaps are visited
+        col0, row0 = self._col_row(left, top)
+        col1, row1 = self._col_row(right, bottom)
+
+        found = []
+        for row in range(row0, row1 + 1):
+            for cell in range(row * self.cols + col0, row * self.cols + col1 + 1):
+                for food in self.cells[cell]:
+                    if left <= food.position.x <= right and top <= food.position.y <= bottom:
+                        found.append(food)
+
+        return found
+
+    def nearest_many(self, points: np.ndarray, radius: np.ndarray):
+        # Position of the nearest food within each point's radius, inf distance if there is none
+        nearest = np.zeros((len(points), 2))
+        distance = np.full(len(points), np.inf)
+        if len(points) == 0 or len(self) == 0:
+            return nearest, distance
+
+        for cell, members in self._group_by_cell(points):
+            reach = int(radius[members].max() // self.cell_size) + 1
+            candidates, _ = self._neighbourhood(cell, reach)
+            if len(candidates) == 0:
+                continue
+
+            dist_sq = ((points[members, None, :] - candidates[None, :, :]) ** 2).sum(axis=2)
+            closest = dist_sq.argmin(axis=1)
+            dist = np.sqrt(dist_sq[np.arange(len(members)), closest])
+
+            hit = dist <= radius[members]
+            nearest[members[hit]] = candidates[closest[hit]]
+            distance[members[hit]] = dist[hit]
+
+        return nearest, distance
+
+    def consume(self, points: np.ndarray, reach: float):
+        # Each point eats at most one food within reach, the closest one still available.
+        # Points are served in index order, equally close food goes to the lowest slot.
+        if len(points) == 0 or len(self) == 0:
+            return [], []
+
+        pair_point, pair_dist, pair_food = [], [], []
+        for cell, members in self._group_by_cell(points):
+            candidates, foods = self._neighbourhood(cell, int(reach // self.cell_size) + 1)
+            if len(candidates) == 0:
+                continue
+
+            dist_sq = ((points[members, None, :] - candidates[None, :, :]) ** 2).sum(axis=2)
+            hit_member, hit_food = np.nonzero(dist_sq <= reach ** 2)
+            pair_point.append(members[hit_member])
+            pair_dist.append(dist_sq[hit_member, hit_food])
+            pair_food.extend(foods[i] for i in hit_food)
+
+        if not pair_food:
+            return [], []
+
+        pair_point = np.concatenate(pair_point)
+        pair_dist = np.concatenate(pair_dist)
+        pair_slot = np.array([food.slot for food in pair_food])
+
+        eaters, eaten = [], []
+        taken = set()
+        for i in np.lexsort((pair_slot, pair_dist, pair_point)):
+            point, food = int(pair_point[i]), pair_food[i]
+            if (eaters and eaters[-1] == point) or food.slot in taken:
+                continue
+
+            eaters.append(point)
+            eaten.append(food)
+            taken.add(food.slot)
+
+        for food in eaten:
+            self.remove(food)
+
+        return eaters, eaten
+
+    def _empty(self):
+        self.items = []
+        self.dead = 0
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        self.cell_positions = [None] * len(self.cells)
+
+    def _insert_many(self, foods: list, cells: np.ndarray):
+        for food, cell in zip(foods, cells.tolist()):
+            food.slot = len(self.items)
+            self.items.append(food)
+
+            food.cell_slot = len(self.cells[cell])
+            self.cells[cell].append(food)
+
+        for cell in np.unique(cells).tolist():
+            self.cell_positions[cell] = None
+
+    def _cells_of(self, points: np.ndarray):
+        cols = np.clip((points[:, 0] // self.cell_size).astype(int), 0, self.cols - 1)
+        rows = np.clip((points[:, 1] // self.cell_size).astype(int), 0, self.rows - 1)
+        return rows * self.cols + cols
+
+    def _group_by_cell(self, points: np.ndarray):
+        # Points sharing a cell share the same candidate set
+        cells = self._cells_of(points)
+
+        order = np.argsort(cells, kind='stable')
+        unique_cells, starts = np.unique(cells[order], return_index=True)
+        for cell, members in zip(unique_cells, np.split(order, starts[1:])):
+            yield int(cell), members
+
+    def _neighbourhood(self, cell: int, reach: int):
+        col, row = cell % self.cols, cell // self.cols
+        blocks, foods = [], []
+        for ring in range(reach + 1):
+            for neighbour in self._ring(col, row, ring):
+                if self.cells[neighbour]:
+                    blocks.append(self._positions_in(neighbour))
+                    foods.extend(self.cells[neighbour])
+
+        if not blocks:
+            return np.empty((0, 2)), foods
+
+        return np.concatenate(blocks), foods
+
+    def _positions_in(self, cell: int):
+        if self.cell_positions[cell] is None:
+            self.cell_positions[cell] = np.array([(food.position.x, food.position.y) for food in self.cells[cell]],
+                                                 dtype=float).reshape(-1, 2)
+
+        return self.cell_positions[cell]
+
+    def _ring(self, col: int, row: int, ring: int):
+        # Cells whose Chebyshev distance from (col, row) is exactly ring
+        for r in range(max(0, row - ring), min(self.rows, row + ring + 1)):
+            if abs(r - row) == ring:
+                for c in range(max(0, col - ring), min(self.cols, col + ring + 1)):
+                    yield r * self.cols + c
+            else:
+                if col - ring >= 0:
+                    yield r * self.cols + col - ring
+                if ring > 0 and col + ring < self.cols:
+                    yield r * self.cols + col + ring
+
+    def _col_row(self, x: float, y: float):
+        col = min(self.cols - 1, max(0, int(x // self.cell_size)))
+        row = min(self.rows - 1, max(0, int(y // self.cell_size)))
+        return col, row
+
+    def _cell_at(self, x: float, y: float):
+        col, row = self._col_row(x, y)
+        return row * self.cols + col
@@ -0,0 +1,71 @@
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps = []
+        self.depth = 0
+        self.first_frame = None
+
+        # Print the report once the first frame is shown, and every load after it
+        self.verbose = False
+
+    @contextmanager
+    def step(self, name: str):
+        begin = time.perf_counter()
+        depth = self.depth
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            self.steps.append((name, begin - self.started, time.perf_counter() - begin, depth))
+
+            if self.verbose and self.first_frame is not None:
+                print(self.format_step(self.steps[-1]), file=sys.stderr)
+
+    def frame_presented(self):
+        if self.first_frame is not None:
+            return
+
+        self.first_frame = time.perf_counter() - self.started
+        if self.verbose:
+            print(self.format(), file=sys.stderr)
+
+    def format(self):
+        lines = ['    start  duration  step']
+        for step in sorted(self.steps, key=lambda step: (step[1], step[3])):
+            lines.append(self.format_step(step))
+
+        if self.first_frame is not None:
+            lines.append(f'{self.first_frame * 1000:7.1f}ms            first frame')
+
+        return '\n'.join(lines)
+
+    def format_step(self, step):
+        name, start, duration, depth = step
+        return f'{start * 1000:7.1f}ms {duration * 1000:7.1f}ms  {"  " * depth}{name}'
+
+
+# Process-wide, module imports are timed too
+startup = StartupReport()
+
+
+class lazy:
+    # Built on first access and then cached on the instance, the build is timed in the startup report
+    def __init__(self, build):
+        self.build = build
+        self.name = build.__name__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        with startup.step(self.name):
+            value = self.build(instance)
+
+        instance.__dict__[self.name] = value
+        return value
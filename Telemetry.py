@@ -0,0 +1,179 @@
+import os
+import csv
+import json
+import queue
+import threading
+
+# Columns of every generation record, in file order. food_left is the food still on the map when the generation
+# ended, unlike the food of Headless stats which is what it started with
+FIELDS = {'generation': int, 'condition': str, 'population': int, 'food_left': int, 'food_eaten': int,
+          'survivors': int, 'offspring': int, 'mutations': int, 'speed_min': float, 'speed_mean': float,
+          'speed_max': float, 'size_min': float, 'size_mean': float, 'size_max': float}
+
+# Queued by the writer thread itself when no record arrived for flush_interval
+FLUSH = object()
+
+
+def generation_record(generation: int, condition, agents: list, food_left: int, survivors: int):
+    # Everything but offspring and mutations, which are only known once the survivors have bred
+    speeds = [agent.speed for agent in agents] or [0.0]
+    sizes = [agent.size for agent in agents] or [0.0]
+
+    return {
+        'generation': generation,
+        'condition': condition.label,
+        'population': len(agents),
+        'food_left': food_left,
+        'food_eaten': sum(agent.eaten for agent in agents),
+        'survivors': survivors,
+        'offspring': 0,
+        'mutations': 0,
+        'speed_min': min(speeds),
+        'speed_mean': sum(speeds) / len(speeds),
+        'speed_max': max(speeds),
+        'size_min': min(sizes),
+        'size_mean': sum(sizes) / len(sizes),
+        'size_max': max(sizes),
+    }
+
+
+class JsonlWriter:
+    def __init__(self, file, appending: bool):
+        self.file = file
+
+    def write(self, records: list):
+        self.file.write(''.join(json.dumps(record) + '\n' for record in records))
+
+    def close(self):
+        pass
+
+
+class CsvWriter:
+    def __init__(self, file, appending: bool):
+        self.writer = csv.DictWriter(file, fieldnames=list(FIELDS))
+        if not appending:
+            self.writer.writeheader()
+
+    def write(self, records: list):
+        self.writer.writerows(records)
+
+    def close(self):
+        pass
+
+
+class ArrowWriter:
+    # One record batch per flush in an Arrow IPC stream, needs the optional pyarrow package
+    binary = True
+
+    def __init__(self, file, appending: bool):
+        try:
+            import pyarrow
+            import pyarrow.ipc
+        except ImportError as error:
+            raise ImportError('The arrow telemetry format needs pyarrow, install it or use csv / jsonl') from error
+
+        self.pyarrow = pyarrow
+        types = {int: pyarrow.int64(), float: pyarrow.float64(), str: pyarrow.string()}
+        self.schema = pyarrow.schema([(name, types[kind]) for name, kind in FIELDS.items()])
+        self.stream = pyarrow.ipc.new_stream(file, self.schema)
+
+    def write(self, records: list):
+        self.stream.write_batch(self.pyarrow.RecordBatch.from_pylist(records, schema=self.schema))
+
+    def close(self):
+        self.stream.close()
+
+
+WRITERS = {'jsonl': JsonlWriter, 'csv': CsvWriter, 'arrow': ArrowWriter}
+
+
+class TelemetryLog:
+    def __init__(self, path: str, fmt: str = None, buffer_size: int = 64, flush_interval: float = 2.0,
+                 max_bytes: int = 64 * 1024 * 1024, backups: int = 5):
+        self.path = path
+        self.fmt = fmt or os.path.splitext(path)[1].lstrip('.')
+        if self.fmt not in WRITERS:
+            raise ValueError(f'Unknown telemetry format {self.fmt}, expected one of {tuple(WRITERS)}')
+
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+        # Records are handed over without blocking, all file work happens on the writer thread
+        self.queue = queue.SimpleQueue()
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def __call__(self, record: dict):
+        self.queue.put(record)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        file, writer = None, None
+        buffer = []
+        try:
+            file, writer = self._open()
+            while True:
+                try:
+                    record = self.queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    record = FLUSH
+
+                if record is not None and record is not FLUSH:
+                    buffer.append(record)
+                    if len(buffer) < self.buffer_size:
+                        continue
+
+                if buffer:
+                    writer.write(buffer)
+                    file.flush()
+                    buffer = []
+
+                if record is None:
+                    return
+
+                if file.tell() >= self.max_bytes:
+                    writer.close()
+                    file.close()
+                    file, writer = None, None
+                    self._rotate()
+                    file, writer = self._open()
+        except Exception as error:
+            self.error = error
+        finally:
+            if writer is not None:
+                writer.close()
+            if file is not None:
+                file.close()
+
+    def _open(self):
+        writer_type = WRITERS[self.fmt]
+        binary = getattr(writer_type, 'binary', False)
+
+        # A stream format cannot continue a previous file, it starts a fresh one
+        if binary and os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self._rotate()
+
+        appending = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        file = open(self.path, 'ab' if binary else 'a', **({} if binary else {'newline': ''}))
+
+        return file, writer_type(file, appending)
+
+    def _rotate(self):
+        # path -> path.1 -> path.2 ..., the oldest beyond backups is dropped
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f'{self.path}.{i}'):
+                os.replace(f'{self.path}.{i}', f'{self.path}.{i + 1}')
+
+        if self.backups > 0:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
@@ -1,11 +1,14 @@
 import math
-import random
+import time
 
 import numpy as np
 import pygame
 
-from App import Window, SpriteLoader, ConditionManager, Condition, EntitySprite
-from Entity import MenuAgent, Agent
+from App import Window, SpriteLoader, ConditionManager, Condition, EntitySprite, TimeWarp, fonts
+from Entity import EntityContext, MenuAgent, Agent
+from Pedigree import PedigreeStore
+from Profiler import FrameProfiler
+from Rng import BatchedStream
 
 
 class UIElement:
@@ -17,7 +20,7 @@ class PauseBox(UIElement):
     def __init__(self, window: Window):
         super().__init__(window)
         self.window = window
-        self.font = pygame.font.Font('assets/PressStart2P-Regular.ttf', 15)
+        self.font = fonts.get(15)
         self.text = self.font.render("PAUSED", True, (255, 255, 255))
         self.box = pygame.Rect((self.window.width // 2) - 60, (self.window.height // 2) - 20, 116, 40)
 
@@ -25,23 +28,31 @@ class PauseBox(UIElement):
         pygame.draw.rect(self.window.screen, (0, 0, 0), self.box.inflate(0, 0), border_radius=3)
         self.window.screen.blit(self.text, ((self.window.width // 2) - (self.text.get_width() // 2),
                                             (self.window.height // 2) - (self.text.get_height() // 2)))
+        self.window.mark_dirty(self.box)
 
 
 class SimulationInformation(UIElement):
-    def __init__(self, window: Window, menu_callback):
+    def __init__(self, window: Window, menu_callback, time_warp_callback):
         super().__init__(window)
-        self.font = pygame.font.Font('assets/PressStart2P-Regular.ttf', 14)
+        self.font = fonts.get(14)
         self.box = pygame.Rect(15, self.window.height - 50, self.window.width - 30, 40)
         self.menu_callback = menu_callback
+        self.time_warp_callback = time_warp_callback
         self.menu_btn = Button(window, self.window.width - 90, self.window.height - 45, 70, 30, 'Menu',
                                13, (9, 9))
+        self.time_warp_btn = Button(window, self.window.width - 170, self.window.height - 45, 70, 30,
+                                    TimeWarp.X1.label, 13, (9, 9))
 
-    def render(self, events, gen, num_agent, num_food):
+    def render(self, events, gen, num_agent, num_food, time_warp: TimeWarp):
         for event in events:
             if event.type == pygame.MOUSEBUTTONUP:
                 if self.menu_btn.collidepoint(event.pos):
                     self.menu_callback()
 
+                if self.time_warp_btn.collidepoint(event.pos):
+                    time_warp = time_warp.next()
+                    self.time_warp_callback(time_warp)
+
         pygame.draw.rect(self.window.screen, (0, 0, 0), self.box.inflate(0, 0), border_radius=3)
 
         gen_text = self.font.render(f'Generation: {gen + 1}  |  '
@@ -49,8 +60,44 @@ class SimulationInformation(UIElement):
                                     f'Food: {num_food}', True, (255, 255, 255))
         self.window.screen.blit(gen_text, (30, self.window.height - 36))
 
+        self.time_warp_btn.title = time_warp.label
+        self.time_warp_btn.render()
         self.menu_btn.render()
 
+        self.window.mark_dirty(self.box)
+
+
+class ProfilerHud(UIElement):
+    def __init__(self, window: Window, profiler: FrameProfiler, refresh_interval: float = 0.5):
+        super().__init__(window)
+        self.profiler = profiler
+        self.font = fonts.get(8)
+        self.line_height = 12
+
+        # Percentiles are recomputed this often (seconds), not every frame
+        self.refresh_interval = refresh_interval
+        self.next_refresh = 0.0
+        self.lines = []
+        self.box = pygame.Rect(10, 10, 0, 0)
+
+    def render(self):
+        now = time.perf_counter()
+        if now >= self.next_refresh:
+            self.next_refresh = now + self.refresh_interval
+            self.lines = [f'{"phase":<14}{"p50":>7}{"p95":>7}{"p99":>7}']
+            for name, (p50, p95, p99) in self.profiler.percentiles().items():
+                self.lines.append(f'{name:<14}{p50:7.2f}{p95:7.2f}{p99:7.2f}')
+
+        width = max(self.font.size(line)[0] for line in self.lines)
+        self.box = pygame.Rect(10, 10, width + 16, len(self.lines) * self.line_height + 12)
+
+        pygame.draw.rect(self.window.screen, (0, 0, 0), self.box, border_radius=3)
+        for i, line in enumerate(self.lines):
+            self.window.screen.blit(self.font.render(line, True, (255, 255, 255)),
+                                    (self.box.x + 8, self.box.y + 6 + i * self.line_height))
+
+        self.window.mark_dirty(self.box)
+
 
 class Button(UIElement):
     def __init__(self, window: Window, x: int, y: int, w: int, h: int, title: str,
@@ -65,7 +112,7 @@ class Button(UIElement):
         self.text_offset = text_offset
         self.active = True
         self.title = title
-        self.font = pygame.font.Font('assets/PressStart2P-Regular.ttf', font_size)
+        self.font = fonts.get(font_size)
 
     def render(self):
         text = self.font.render(self.title, True, self.text_color if self.active else (0, 0, 0))
@@ -81,11 +128,12 @@ class Button(UIElement):
 
 
 class AgentCard(UIElement):
-    def __init__(self, window: Window, sl: SpriteLoader, x: int, y: int):
+    def __init__(self, window: Window, sl: SpriteLoader, rng: BatchedStream, x: int, y: int):
         super().__init__(window)
         self.sl = sl
-        self.font1 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 13)
-        self.font2 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 11)
+        self.rng = rng
+        self.font1 = fonts.get(13)
+        self.font2 = fonts.get(11)
         self.box = pygame.Rect(x, y, 220, 350)
 
         self.shadow = pygame.Surface((self.box.width, self.box.height), pygame.SRCALPHA)
@@ -95,7 +143,7 @@ class AgentCard(UIElement):
 
     def render(self, agent: Agent, is_active: bool):
         if self.current_frame == -1:
-            self.current_frame = random.randint(0, self.sl.get_num_frame_in_entity_sprite(agent.sprite) - 1)
+            self.current_frame = self.rng.integers(0, self.sl.get_num_frame_in_entity_sprite(agent.sprite))
 
         # Measures
         current_sprite = self.sl.get_entity_sprite_at_frame(agent.sprite, self.current_frame)
@@ -116,9 +164,7 @@ class AgentCard(UIElement):
         self.window.screen.blit(self.shadow, (self.box.x + 8, self.box.y + 8))
         pygame.draw.rect(self.window.screen, (0, 0, 0), self.box.inflate(0, 0), border_radius=5)
 
-        self.window.screen.blit(pygame.transform.scale(
-            current_sprite, (current_sprite.get_width() * 4.5,
-                             current_sprite.get_height() * 4.5)), sprite_pos)
+        self.window.screen.blit(self.sl.get_scaled_entity_sprite(agent.sprite, self.current_frame, 4.5), sprite_pos)
 
         self.window.screen.blit(title,
                                 (sprite_pos[0] + (sprite_width * 4.5 // 2) - (title_size[0] // 2), sprite_pos[1] + 90))
@@ -133,19 +179,37 @@ class AgentCard(UIElement):
         if pygame.time.get_ticks() % 10 == 0:
             self.current_frame = pygame.time.get_ticks() % self.sl.get_num_frame_in_entity_sprite(agent.sprite)
 
+    def animate(self, agent: Agent):
+        animate_card_sprite(self, agent)
+
     def collidepoint(self, pos):
         return self.box.collidepoint(pos)
 
 
+def animate_card_sprite(card, agent: Agent):
+    # Idle frames only repaint the card's sprite, and only when its frame changed
+    frame = card.current_frame
+    if pygame.time.get_ticks() % 10 == 0:
+        card.current_frame = pygame.time.get_ticks() % card.sl.get_num_frame_in_entity_sprite(agent.sprite)
+
+    if frame != card.current_frame:
+        sprite = card.sl.get_scaled_entity_sprite(agent.sprite, card.current_frame, 4.5)
+        rect = pygame.Rect((card.box.x + 75, card.box.y + 40), sprite.get_size())
+        card.window.screen.fill((0, 0, 0), rect)
+        card.window.screen.blit(sprite, rect)
+        card.window.mark_dirty(rect)
+
+
 class AgentChildCard(AgentCard):
-    def __init__(self, window: Window, sl: SpriteLoader, x: int, y: int):
-        super().__init__(window, sl, x, y)
+    def __init__(self, window: Window, sl: SpriteLoader, rng: BatchedStream, x: int, y: int):
+        super().__init__(window, sl, rng, x, y)
 
-        self.font3 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 16)
+        self.font3 = fonts.get(16)
+        self.mutated_label = pygame.transform.rotate(self.font3.render('Mutated', True, (255, 255, 0)), 348)
 
     def render(self, agent: Agent, is_mutate: bool, speed_mutation: float = 0.0, size_mutation: float = 0.0):
         if self.current_frame == -1:
-            self.current_frame = random.randint(0, self.sl.get_num_frame_in_entity_sprite(agent.sprite) - 1)
+            self.current_frame = self.rng.integers(0, self.sl.get_num_frame_in_entity_sprite(agent.sprite))
 
         # Measures
         current_sprite = self.sl.get_entity_sprite_at_frame(agent.sprite, self.current_frame)
@@ -164,17 +228,13 @@ class AgentChildCard(AgentCard):
         else:
             speed = self.font2.render(f'Speed: {agent.speed:.2G}', True, (255, 255, 255))
             awareness = self.font2.render(f'Size: {agent.size:.2G}', True, (255, 255, 255))
-        mutated = pygame.transform.rotate(self.font3.render('Mutated', True, (255, 255, 0)), 348)
 
         # Render
-        current_sprite = self.sl.get_entity_sprite_at_frame(agent.sprite, self.current_frame)
-
         self.window.screen.blit(self.shadow, (self.box.x + 8, self.box.y + 8))
         pygame.draw.rect(self.window.screen, (0, 0, 0), self.box.inflate(0, 0), border_radius=5)
 
-        self.window.screen.blit(pygame.transform.scale(
-            current_sprite, (current_sprite.get_width() * 4.5,
-                             current_sprite.get_height() * 4.5)), (self.box.x + 75, self.box.y + 40))
+        self.window.screen.blit(self.sl.get_scaled_entity_sprite(agent.sprite, self.current_frame, 4.5),
+                                (self.box.x + 75, self.box.y + 40))
 
         self.window.screen.blit(title,
                                 (sprite_pos[0] + (sprite_width * 4.5 // 2) - (title_size[0] // 2), sprite_pos[1] + 90))
@@ -184,24 +244,25 @@ class AgentChildCard(AgentCard):
         self.window.screen.blit(awareness, (self.box.x + 22, self.box.y + 235))
         if is_mutate:
             pygame.draw.rect(self.window.screen, (255, 255, 0), self.box, 5, border_radius=5)
-            self.window.screen.blit(mutated, (self.box.x + 55, self.box.y + 280))
+            self.window.screen.blit(self.mutated_label, (self.box.x + 55, self.box.y + 280))
 
         if pygame.time.get_ticks() % 10 == 0:
             self.current_frame = pygame.time.get_ticks() % self.sl.get_num_frame_in_entity_sprite(agent.sprite)
 
 
 class ParentsSelection(UIElement):
-    def __init__(self, window: Window, sl: SpriteLoader):
+    def __init__(self, window: Window, sl: SpriteLoader, rng: BatchedStream, genetics: BatchedStream):
         super().__init__(window)
+        self.genetics = genetics
 
-        self.font = pygame.font.Font('assets/PressStart2P-Regular.ttf', 25)
+        self.font = fonts.get(25)
         self.title = self.font.render('Choose 2 Parents', True, (0, 0, 0))
 
         self.random_btn = Button(window, 375, 520, 115, 40, 'Random', 15, (13, 13),
                                  button_color=(0, 0, 0), text_color=(255, 255, 255))
         self.confirm_btn = Button(window, 505, 520, 115, 40, 'Confirm', 15, (13, 13),
                                   button_color=(0, 0, 0), text_color=(255, 255, 255))
-        self.card = [AgentCard(window, sl, 28 + c * 240, 130) for c in range(4)]
+        self.card = [AgentCard(window, sl, rng, 28 + c * 240, 130) for c in range(4)]
         self.active = [False for _ in range(4)]
 
     def reset(self):
@@ -219,8 +280,8 @@ class ParentsSelection(UIElement):
                     setattr(event, 'handled', True)
 
                 if self.random_btn.collidepoint(event.pos):
-                    prs = np.random.choice(parents, 2, replace=False)
-                    callback(prs[0], prs[1], True)
+                    prs = self.genetics.generator.choice(len(parents), 2, replace=False)
+                    callback(parents[prs[0]], parents[prs[1]], True)
 
                 for i in range(len(self.card)):
                     if self.card[i].collidepoint(event.pos):
@@ -239,17 +300,21 @@ class ParentsSelection(UIElement):
 
         self.random_btn.render()
 
+    def animate(self, parents: list[Agent]):
+        for i in range(len(parents)):
+            self.card[i].animate(parents[i])
+
 
 class Offspring(UIElement):
-    def __init__(self, window: Window, sl: SpriteLoader):
+    def __init__(self, window: Window, sl: SpriteLoader, rng: BatchedStream):
         super().__init__(window)
 
-        self.font = pygame.font.Font('assets/PressStart2P-Regular.ttf', 25)
+        self.font = fonts.get(25)
         self.title = self.font.render('Result Offspring', True, (0, 0, 0))
 
         self.confirm_btn = Button(window, 455, 520, 85, 40, 'Okay', 15, (13, 13),
                                   button_color=(0, 0, 0), text_color=(255, 255, 255))
-        self.card = [AgentChildCard(window, sl, 28 + c * 240, 130) for c in range(4)]
+        self.card = [AgentChildCard(window, sl, rng, 28 + c * 240, 130) for c in range(4)]
 
     def render(self, offsprings: list[(Agent, bool, int, int)], events, callback):
         for event in events:
@@ -266,6 +331,10 @@ class Offspring(UIElement):
 
         self.confirm_btn.render()
 
+    def animate(self, offsprings: list[(Agent, bool, int, int)]):
+        for i in range(len(offsprings)):
+            self.card[i].animate(offsprings[i][0])
+
 
 class SeekBar(UIElement):
     def __init__(self, window: Window, x, y, w, h, min_lim, max_lim, init_value, callback):
@@ -308,8 +377,8 @@ class MainMenu(UIElement):
 
         self.game_start_callback = game_start_callback
 
-        self.font1 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 35)
-        self.font2 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 15)
+        self.font1 = fonts.get(35)
+        self.font2 = fonts.get(15)
 
         self.population_seekbar = SeekBar(self.window, 268, 180, 200, 14, 1,
                                           20, 10, population_callback)
@@ -322,7 +391,7 @@ class MainMenu(UIElement):
         self.title = self.font1.render('Genetics Playground', True, (0, 0, 0))
         self.start_btn = Button(window, 40, 310, 125, 44, 'Start', 20, (13, 13))
 
-        self.menu_agent = MenuAgent(window, sl, cm, EntitySprite.CHICKEN, 3.0, sprite_callback,
+        self.menu_agent = MenuAgent(EntityContext(window, sl, cm), EntitySprite.CHICKEN, 3.0, sprite_callback,
                                     bound=((50, self.window.height - 220),
                                            (self.window.width - 50, self.window.height - 50)))
 
@@ -361,8 +430,8 @@ class GameOver(UIElement):
         super().__init__(window)
         self.menu_callback = menu_callback
 
-        self.font1 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 35)
-        self.font2 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 15)
+        self.font1 = fonts.get(35)
+        self.font2 = fonts.get(15)
 
         self.title = self.font1.render('Game Over', True, (0, 0, 0))
         self.menu_btn = Button(window, 400, 360, 210, 44, 'Back to Menu', 15, (16, 16))
@@ -386,9 +455,10 @@ class ConditionCard(UIElement):
     def __init__(self, window: Window, sl: SpriteLoader):
         super().__init__(window)
         self.sl = sl
-        self.font1 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 21)
-        self.font2 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 11)
-        self.font3 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 44)
+        self.font1 = fonts.get(21)
+        self.font2 = fonts.get(11)
+        self.font3 = fonts.get(44)
+        self.none_label = pygame.transform.rotate(self.font3.render('None', True, (180, 180, 180)), 348)
 
         self.pos = (354, 130)
         self.box = pygame.Rect(self.pos[0], self.pos[1], 280, 350)
@@ -414,9 +484,7 @@ class ConditionCard(UIElement):
             title = self.font1.render(condition.label, True, (255, 255, 255))
 
             # Render
-            self.window.screen.blit(pygame.transform.scale(
-                current_sprite, (current_sprite.get_width() * 5,
-                                 current_sprite.get_height() * 5)), sprite_pos)
+            self.window.screen.blit(self.sl.get_scaled_condition_sprite(condition, self.current_frame, 5), sprite_pos)
 
             self.window.screen.blit(title, (sprite_pos[0] + (sprite_width * 5 // 2) - (title_size[0] // 2), sprite_pos[1] + 120))
 
@@ -434,8 +502,22 @@ class ConditionCard(UIElement):
 
         pygame.draw.circle(self.window.screen, (50, 50, 50),
                            (self.pos[0] + 144, self.pos[1] + 180), 55, width=4)
-        title = pygame.transform.rotate(self.font3.render('None', True, (180, 180, 180)), 348)
-        self.window.screen.blit(title, (self.pos[0] + 56, self.pos[1] + 142))
+        self.window.screen.blit(self.none_label, (self.pos[0] + 56, self.pos[1] + 142))
+
+    def animate(self, condition: Condition):
+        if condition == Condition.NONE:
+            return
+
+        frame = self.current_frame
+        if pygame.time.get_ticks() % 5 == 0:
+            self.current_frame = pygame.time.get_ticks() % self.sl.get_num_frame_in_condition_sprite(condition)
+
+        if frame != self.current_frame:
+            sprite = self.sl.get_scaled_condition_sprite(condition, self.current_frame, 5)
+            rect = pygame.Rect((self.box.x + 102, self.box.y + 40), sprite.get_size())
+            self.window.screen.fill((0, 0, 0), rect)
+            self.window.screen.blit(sprite, rect)
+            self.window.mark_dirty(rect)
 
     def render_wrapped_text(self, text, font, max_width):
         words = text.split(' ')
@@ -460,7 +542,7 @@ class ConditionOverview(UIElement):
     def __init__(self, window: Window, sl: SpriteLoader):
         super().__init__(window)
 
-        self.font = pygame.font.Font('assets/PressStart2P-Regular.ttf', 25)
+        self.font = fonts.get(25)
         self.title = self.font.render('Environment Modification', True, (0, 0, 0))
 
         self.confirm_btn = Button(window, 455, 520, 85, 40, 'Okay', 15, (13, 13),
@@ -478,15 +560,20 @@ class ConditionOverview(UIElement):
         self.card.render(condition)
         self.confirm_btn.render()
 
+    def animate(self, condition: Condition):
+        self.card.animate(condition)
+
 
 class AgentTreeCard(UIElement):
-    def __init__(self, window: Window, sl: SpriteLoader, x: int, y: int):
+    def __init__(self, window: Window, sl: SpriteLoader, rng: BatchedStream, x: int, y: int):
         super().__init__(window)
 
         self.sl = sl
-        self.font1 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 13)
-        self.font2 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 11)
-        self.font3 = pygame.font.Font('assets/PressStart2P-Regular.ttf', 22)
+        self.rng = rng
+        self.font1 = fonts.get(13)
+        self.font2 = fonts.get(11)
+        self.font3 = fonts.get(22)
+        self.unknown_label = pygame.transform.rotate(self.font3.render('Unknown', True, (180, 180, 180)), 348)
         self.box = pygame.Rect(x, y, 220, 350)
 
         self.shadow = pygame.Surface((self.box.width, self.box.height), pygame.SRCALPHA)
@@ -509,7 +596,7 @@ class AgentTreeCard(UIElement):
 
         if agent is not None:
             if self.current_frame == -1:
-                self.current_frame = random.randint(0, self.sl.get_num_frame_in_entity_sprite(agent.sprite) - 1)
+                self.current_frame = self.rng.integers(0, self.sl.get_num_frame_in_entity_sprite(agent.sprite))
 
             # Measures
             current_sprite = self.sl.get_entity_sprite_at_frame(agent.sprite, self.current_frame)
@@ -536,9 +623,8 @@ class AgentTreeCard(UIElement):
             fitness = self.font2.render(f'Gathered: {agent.eaten}', True, (255, 255, 255))
 
             # Render
-            self.window.screen.blit(pygame.transform.scale(
-                current_sprite, (current_sprite.get_width() * 4.5,
-                                 current_sprite.get_height() * 4.5)), sprite_pos)
+            self.window.screen.blit(self.sl.get_scaled_entity_sprite(agent.sprite, self.current_frame, 4.5),
+                                    sprite_pos)
 
             self.window.screen.blit(title, (sprite_pos[0] + (sprite_width * 4.5 // 2) - (title_size[0] // 2), sprite_pos[1] + 90))
             self.window.screen.blit(agent_id, (sprite_pos[0] + (sprite_width * 4.5 // 2) - (id_size[0] // 2), sprite_pos[1] + 110))
@@ -554,8 +640,7 @@ class AgentTreeCard(UIElement):
         else:
             pygame.draw.circle(self.window.screen, (50, 50, 50),
                                (self.box.x + 110, self.box.y + 180), 60, width=4)
-            title = pygame.transform.rotate(self.font3.render('Unknown', True, (180, 180, 180)), 348)
-            self.window.screen.blit(title, (self.box.x + 35, self.box.y + 155))
+            self.window.screen.blit(self.unknown_label, (self.box.x + 35, self.box.y + 155))
 
         if is_parent:
             if parent_num == 1:
@@ -563,19 +648,26 @@ class AgentTreeCard(UIElement):
             elif parent_num == 2:
                 pygame.draw.rect(self.window.screen, (0, 0, 180), self.box, 5, border_radius=5)
 
+    def animate(self, agent: Agent):
+        if agent is not None:
+            animate_card_sprite(self, agent)
+
 
 class InspectAgent(UIElement):
-    def __init__(self, window: Window, sl: SpriteLoader, agent: Agent):
+    def __init__(self, window: Window, sl: SpriteLoader, rng: BatchedStream, pedigree: PedigreeStore,
+                 agent: Agent):
         super().__init__(window)
 
-        self.font = pygame.font.Font('assets/PressStart2P-Regular.ttf', 18)
+        self.font = fonts.get(18)
 
         self.agent = agent
+        self.parent1 = pedigree.get(agent.parent1_id)
+        self.parent2 = pedigree.get(agent.parent2_id)
         self.confirm_btn = Button(window, 455, 530, 85, 40, 'Okay', 15, (13, 13),
                                   button_color=(0, 0, 0), text_color=(255, 255, 255))
-        self.agent_card = AgentTreeCard(window, sl, 700, 130)
-        self.agent_parent1_card = AgentTreeCard(window, sl, 260, 90)
-        self.agent_parent2_card = AgentTreeCard(window, sl, 50, 150)
+        self.agent_card = AgentTreeCard(window, sl, rng, 700, 130)
+        self.agent_parent1_card = AgentTreeCard(window, sl, rng, 260, 90)
+        self.agent_parent2_card = AgentTreeCard(window, sl, rng, 50, 150)
 
     def render(self, events, confirm_callback, parent_callback):
         for event in events:
@@ -586,11 +678,16 @@ class InspectAgent(UIElement):
 
         self.agent_card.render(events, self.agent, False)
         self.draw_arrow((0, 0, 0), 530, 300, 650, 300)
-        self.agent_parent1_card.render(events, self.agent.parent1, True, 1, parent_callback)
-        self.agent_parent2_card.render(events, self.agent.parent2, True, 2, parent_callback)
+        self.agent_parent1_card.render(events, self.parent1, True, 1, parent_callback)
+        self.agent_parent2_card.render(events, self.parent2, True, 2, parent_callback)
 
         self.confirm_btn.render()
 
+    def animate(self):
+        self.agent_card.animate(self.agent)
+        self.agent_parent1_card.animate(self.parent1)
+        self.agent_parent2_card.animate(self.parent2)
+
     def draw_arrow(self, color, x1, y1, x2, y2, width=6, arrowhead_length=14, arrowhead_angle=30):
         angle = math.atan2(y2 - y1, x2 - x1)
 
@@ -1,4 +1,6 @@
 class Position:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: int = 0, y: int = 0):
         self.x = x
         self.y = y
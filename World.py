@@ -0,0 +1,210 @@
+import math
+
+import numpy as np
+
+from App import ConditionManager, Condition
+from Spatial import FoodGrid
+from Utils import Position
+
+
+class RowPosition:
+    def __init__(self, world: "WorldState", row: int):
+        self.world = world
+        self.row = row
+
+    @property
+    def x(self):
+        return float(self.world.position[self.row, 0])
+
+    @x.setter
+    def x(self, value):
+        self.world.position[self.row, 0] = value
+
+    @property
+    def y(self):
+        return float(self.world.position[self.row, 1])
+
+    @y.setter
+    def y(self, value):
+        self.world.position[self.row, 1] = value
+
+
+# Agent attribute kept on the object while detached and in the world arrays while attached
+class WorldField:
+    def __init__(self, read=float):
+        self.read = read
+        self.name = None
+        self.local = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.local = f'_{name}'
+
+    def __get__(self, agent, owner=None):
+        if agent is None:
+            return self
+
+        if agent.world is None:
+            return getattr(agent, self.local)
+
+        return self.read(agent.world, self.name, agent.row)
+
+    def __set__(self, agent, value):
+        if agent.world is None:
+            setattr(agent, self.local, value)
+            return
+
+        if self.name == 'position':
+            value = (value.x, value.y)
+
+        getattr(agent.world, self.name)[agent.row] = value
+
+
+def read_scalar(world, name, row):
+    return float(getattr(world, name)[row])
+
+
+def read_count(world, name, row):
+    return int(getattr(world, name)[row])
+
+
+def read_pair(world, name, row):
+    pair = getattr(world, name)[row]
+    return float(pair[0]), float(pair[1])
+
+
+def read_position(world, name, row):
+    return RowPosition(world, row)
+
+
+class WorldState:
+    fields = ('position', 'direction', 'speed', 'size', 'energy', 'eaten')
+
+    def __init__(self, bound_min: tuple[int, int], bound_max: tuple[int, int], capacity: int = 64,
+                 rng: np.random.Generator = None):
+        self.bound_min = bound_min
+        self.bound_max = bound_max
+
+        # New headings for a whole batch of rows come from one draw
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.count = 0
+        self.agents = []
+
+        self.position = np.zeros((capacity, 2))
+        self.direction = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.energy = np.zeros(capacity)
+        self.eaten = np.zeros(capacity, dtype=np.int64)
+
+    def attach(self, agent):
+        if self.count == len(self.speed):
+            self._grow(2 * len(self.speed))
+
+        row = self.count
+        self.position[row] = (agent.position.x, agent.position.y)
+        self.direction[row] = agent.direction
+        self.speed[row] = agent.speed
+        self.size[row] = agent.size
+        self.energy[row] = agent.energy
+        self.eaten[row] = agent.eaten
+
+        # The row is authoritative while attached, local copies come back on clear()
+        for name in self.fields:
+            setattr(agent, f'_{name}', None)
+
+        agent.world = self
+        agent.row = row
+        self.agents.append(agent)
+        self.count += 1
+
+        return row
+
+    def clear(self):
+        # Hand every row back to its agent so it stays readable (lineage, cards) after leaving the world
+        for agent in self.agents:
+            position = agent.position
+            direction = agent.direction
+            speed, size, energy, eaten = agent.speed, agent.size, agent.energy, agent.eaten
+
+            agent.world = None
+            agent.row = -1
+            agent.position = Position(position.x, position.y)
+            agent.direction = direction
+            agent.speed, agent.size, agent.energy, agent.eaten = speed, size, energy, eaten
+
+        self.agents = []
+        self.count = 0
+
+    def step(self, cm: ConditionManager, foods: FoodGrid):
+        moving = np.flatnonzero(self.energy[:self.count] > 0)
+        if len(moving) == 0:
+            return 0
+
+        pos = self.position[moving]
+
+        if len(foods) > 0:
+            # Only food within an agent's size can attract it
+            nearest, distance = foods.nearest_many(pos, self.size[moving])
+            to_food = nearest - pos
+
+            speed_modifier = 1
+            if cm.current == Condition.SNOW:
+                speed_modifier = 0.5
+
+            if cm.current == Condition.WIND:
+                pos += np.asarray(cm.direction) * 1.2
+
+            seeking = distance <= self.size[moving]
+
+            # Wanderers bouncing off the edge pick a new heading
+            at_edge = ((pos[:, 0] <= self.bound_min[0])
+                       | (pos[:, 0] >= self.bound_max[0])
+                       | (pos[:, 1] <= self.bound_min[1])
+                       | (pos[:, 1] >= self.bound_max[1] - 50))
+            self.pick_directions(moving[~seeking & at_edge])
+
+            # Normalize direction towards food for agents close enough to see it
+            heading = self.direction[moving]
+            heading[seeking] = to_food[seeking] / np.maximum(distance[seeking], 1e-12)[:, None]
+
+            pos += heading * (self.speed[moving] * speed_modifier)[:, None]
+
+        # Clamp to screen edge
+        np.clip(pos[:, 0], self.bound_min[0], self.bound_max[0], out=pos[:, 0])
+        np.clip(pos[:, 1], self.bound_min[1], self.bound_max[1] - 50, out=pos[:, 1])
+        self.position[moving] = pos
+
+        # Cost to move
+        self.energy[moving] -= 0.1 * self.speed[moving] + 0.00001 * self.size[moving]
+
+        return len(moving)
+
+    def consume(self, foods: FoodGrid, reach: float):
+        # Each agent eats at most one food per tick, earlier rows get first pick
+        eaters, eaten = foods.consume(self.position[:self.count], reach)
+        self.eaten[eaters] += 1
+
+        return eaten
+
+    def within(self, left: float, top: float, right: float, bottom: float):
+        # Rows whose position lies inside the rectangle, in row order
+        pos = self.position[:self.count]
+        return np.flatnonzero((pos[:, 0] >= left) & (pos[:, 0] <= right)
+                              & (pos[:, 1] >= top) & (pos[:, 1] <= bottom)).tolist()
+
+    def pick_directions(self, rows: np.ndarray):
+        if len(rows) == 0:
+            return
+
+        angle = self.rng.uniform(0, 2 * math.pi, len(rows))
+        self.direction[rows, 0] = np.cos(angle)
+        self.direction[rows, 1] = np.sin(angle)
+
+    def _grow(self, capacity: int):
+        for name in self.fields:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
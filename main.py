@@ -1,20 +1,118 @@
-import math
-
-from App import IDGenerator, GameState
-from Entity import Food
-from UIElement import *
+import time
+import argparse
+
+from Startup import startup, lazy
+
+with startup.step('imports'):
+    from App import IDGenerator, GameState, TimeWarp
+    from Entity import EntityContext, Food, render_agents, spawn_food, visible_agents
+    from UIElement import *
+    from Spatial import FoodGrid
+    from World import WorldState
+    from Pedigree import PedigreeStore
+    import Checkpoint
+    from Checkpoint import Autosave
+    from Telemetry import TelemetryLog, generation_record
+    from Profiler import profiler
+    from Rng import SimulationRNG
+    import Reproduction
 
 
 class Simulation:
-    def __init__(self):
+    def __init__(self, vectorized: bool = True, resume: str = None, autosave: Autosave = None,
+                 telemetry: TelemetryLog = None, trace: str = None, seed: int = None,
+                 world_size: tuple[int, int] = None):
+        # Every random draw of the run comes from this one seed, see Rng.SimulationRNG
+        self.rng = SimulationRNG(seed)
+
         # Backend services
-        self.sl = SpriteLoader()
-        self.idg = IDGenerator()
-        self.cm = ConditionManager()
+        with startup.step('sprite loader'):
+            self.sl = SpriteLoader()
+        self.idg = IDGenerator(self.rng.ids)
+        self.cm = ConditionManager(self.rng.conditions)
+
+        # A resumed run keeps the arena it was saved in unless one is given
+        if resume is not None and world_size is None:
+            world_size = Checkpoint.world_size(resume)
 
         # Initialize Pygame
-        pygame.init()
-        self.window = Window(self.sl, self.cm)
+        with startup.step('pygame init'):
+            pygame.init()
+        with startup.step('window'):
+            self.window = Window(self.sl, self.cm, self.rng.tiles, world_size=world_size)
+
+        with startup.step('world setup'):
+            self.setup(vectorized)
+
+        # UI Elements are built on first use, see the lazy properties below
+        self.ui_agent_inspect = None
+
+        self.autosave = autosave
+        self.telemetry = telemetry
+        if resume is not None:
+            with startup.step('resume checkpoint'):
+                Checkpoint.load(self, resume)
+
+        # Chrome trace of every profiled phase, written on exit
+        self.trace = trace
+        if self.trace is not None:
+            profiler.start_trace()
+
+        self.run()
+        pygame.quit()
+
+        if self.trace is not None:
+            profiler.export_trace(self.trace)
+
+        if self.telemetry is not None:
+            self.telemetry.close()
+
+        # The writer is a daemon thread, a snapshot still in flight would die with the process
+        if self.autosave is not None:
+            self.autosave.wait()
+
+    @lazy
+    def ui_pause_box(self):
+        return PauseBox(self.window)
+
+    @lazy
+    def ui_sim_bar(self):
+        return SimulationInformation(self.window, self.ui_callback_back_to_menu, self.ui_callback_time_warp_changed)
+
+    @lazy
+    def ui_agent_card(self):
+        return ParentsSelection(self.window, self.sl, self.rng.visual, self.rng.genetics)
+
+    @lazy
+    def ui_offspring_card(self):
+        return Offspring(self.window, self.sl, self.rng.visual)
+
+    @lazy
+    def ui_condition_card(self):
+        return ConditionOverview(self.window, self.sl)
+
+    @lazy
+    def ui_main_menu(self):
+        return MainMenu(self.window, self.sl, self.cm, self.ui_callback_init_population_changed,
+                        self.ui_callback_init_food_changed, self.ui_callback_sprite_changed,
+                        self.ui_callback_game_reset, self.ui_callback_mutation_chance_changed,
+                        self.ui_callback_mutation_strength_changed)
+
+    @lazy
+    def ui_game_over(self):
+        return GameOver(self.window, self.ui_callback_back_to_menu)
+
+    @lazy
+    def ui_profiler_hud(self):
+        return ProfilerHud(self.window, profiler)
+
+    def setup(self, vectorized: bool):
+        self.context = EntityContext(self.window, self.sl, self.cm, self.rng)
+
+        # Array-backed world state, None falls back to per-agent updates
+        self.world = (WorldState((0, 0), (self.window.world_width, self.window.world_height),
+                                 rng=self.rng.movement.generator)
+                      if vectorized else None)
 
         # Params
         self.initial_food_amount = 100
@@ -24,8 +122,26 @@ class Simulation:
         self.mutation_strength = 0.5
         self.max_offspring = 4
 
+        # Fixed timestep, one step per frame at 1x
+        self.time_warp = TimeWarp.X1
+        self.sim_timestep = 1 / 60
+        self.sim_accumulator = 0.0
+        self.max_substeps = 64
+
+        # At max warp the screen is only redrawn this often (seconds)
+        self.max_warp_frame_time = 0.1
+
+        # Camera pan speed (screen pixels per second) and zoom factor per mouse wheel notch
+        self.pan_speed = 600
+        self.zoom_factor = 1.1
+
+        # Agents drawn last frame, so the ones that left the view get their old spot repainted
+        self.drawn_agents = []
+
         # Game states
         self.game_state = GameState.MAIN_MENU
+        self.drawn_state = None
+        self.input_pending = False
         self.ui_parent1, self.ui_parent2 = None, None
         self.ui_offspring_confirmed = False
         self.is_auto = False
@@ -34,76 +150,131 @@ class Simulation:
         self.offsprings = None
         self.card_choices = None
         self.sprite = EntitySprite.CHICKEN
-        self.agents = [Agent(self.window, self.sl, self.cm,
-                             self.sprite, self.idg(), self.generation) for _ in range(self.initial_population)]
-        self.foods = [Food(self.window, self.sl, self.cm) for _ in range(self.initial_food_amount)]
-
-        # UI Elements
-        self.ui_pause_box = PauseBox(self.window)
-        self.ui_sim_bar = SimulationInformation(self.window, self.ui_callback_back_to_menu)
-        self.ui_agent_card = ParentsSelection(self.window, self.sl)
-        self.ui_offspring_card = Offspring(self.window, self.sl)
-        self.ui_condition_card = ConditionOverview(self.window, self.sl)
-        self.ui_main_menu = MainMenu(self.window, self.sl, self.cm, self.ui_callback_init_population_changed,
-                                     self.ui_callback_init_food_changed, self.ui_callback_sprite_changed,
-                                     self.ui_callback_game_reset, self.ui_callback_mutation_chance_changed,
-                                     self.ui_callback_mutation_strength_changed)
-        self.ui_game_over = GameOver(self.window, self.ui_callback_back_to_menu)
-        self.ui_agent_inspect = None
+        self.pedigree = PedigreeStore()
+        self.agents = [Agent(self.context, self.sprite, self.idg(), self.generation,
+                             world=self.world) for _ in range(self.initial_population)]
+        self.foods = FoodGrid(self.window.world_width, self.window.world_height)
+        spawn_food(self.context, self.foods, self.initial_food_amount)
+        self.last_eaten = []
+        self.eaten_foods = []
 
-        self.run()
-        pygame.quit()
+        # Called with the simulation at the start of each generation, see Checkpoint.Autosave
+        self.autosave = None
 
-    def run_simulation(self, events, is_paused: bool):
-        agents_moved = 0
+        # Called with one record per finished generation, see Telemetry.TelemetryLog
+        self.telemetry = None
+        self.pending_record = None
 
+    def run_simulation(self, events, is_paused: bool):
         if len(self.foods) == 0:
             return True
 
-        # Update agents
-        for agent in self.agents:
-            if not is_paused and agent.move(self.foods.copy()):
-                agents_moved = agents_moved + 1
+        done = False
+        if not is_paused:
+            done = self.advance_simulation(self.window.frame_time)
+
+        # Update agents, only those the camera sees
+        with profiler.phase('agents render'):
+            visible = visible_agents(self.window, self.agents, self.world)
+
+            shown = set(visible)
+            for agent in self.drawn_agents:
+                if agent not in shown and agent.drawn_rect is not None:
+                    self.window.mark_dirty(agent.drawn_rect)
+                    agent.drawn_rect = None
+            self.drawn_agents = visible
+
+            render_agents(self.window, visible, events, self.ui_callback_inspect_called)
+
+        with profiler.phase('food render'):
+            # Eaten food leaves a spot to repaint
+            for food in self.eaten_foods:
+                self.window.mark_dirty(food.get_rect())
+            self.eaten_foods = []
+
+            # Update Food in view
+            left, top, right, bottom = self.window.camera.view_rect
+            for food in self.foods.within_rect(left - Food.size, top - Food.size,
+                                               right + Food.size, bottom + Food.size):
+                food.render()
+
+        return done
+
+    def advance_simulation(self, frame_time: float):
+        # Max warp steps for a whole frame budget, which also throttles rendering
+        if self.time_warp == TimeWarp.MAX:
+            deadline = time.perf_counter() + self.max_warp_frame_time
+            while time.perf_counter() < deadline:
+                done = self.step_simulation()
+                self.eaten_foods.extend(self.last_eaten)
+                if done:
+                    return True
 
-            agent.render(events, self.ui_callback_inspect_called)
+            return False
 
-        # Food be eaten
-        if not is_paused:
-            for agent in self.agents:
-                for food in self.foods.copy():
-                    # Euclidean dist
-                    dist = math.sqrt((agent.position.x - food.position.x) ** 2 +
-                                     (agent.position.y - food.position.y) ** 2)
+        self.sim_accumulator += frame_time * self.time_warp.factor
 
-                    if dist <= (food.size / 2):
-                        agent.eaten = agent.eaten + 1
-                        self.foods.remove(food)
-                        break
+        steps = 0
+        while self.sim_accumulator >= self.sim_timestep:
+            self.sim_accumulator -= self.sim_timestep
+            steps += 1
 
-        # Update Food
-        for food in self.foods:
-            food.render()
+            done = self.step_simulation()
+            self.eaten_foods.extend(self.last_eaten)
+            if done:
+                self.sim_accumulator = 0.0
+                return True
 
-        # Termination if all out of energy
-        if agents_moved == 0 and not is_paused:
-            return True
+            # Fall behind rather than stall the frame
+            if steps >= self.max_substeps:
+                self.sim_accumulator = 0.0
+                break
 
         return False
 
+    def step_simulation(self):
+        agents_moved = 0
+
+        if len(self.foods) == 0:
+            return True
+
+        # Update agents
+        with profiler.phase('move'):
+            if self.world is not None:
+                agents_moved = self.world.step(self.cm, self.foods)
+            else:
+                for agent in self.agents:
+                    if agent.move(self.foods):
+                        agents_moved = agents_moved + 1
+
+        # Food be eaten, every contact of this tick resolved in one batch
+        with profiler.phase('consume'):
+            if self.world is not None:
+                self.last_eaten = self.world.consume(self.foods, Food.reach)
+            else:
+                points = np.array([(agent.position.x, agent.position.y) for agent in self.agents]).reshape(-1, 2)
+                eaters, self.last_eaten = self.foods.consume(points, Food.reach)
+                for i in eaters:
+                    self.agents[i].eaten = self.agents[i].eaten + 1
+
+        # Termination if all out of energy
+        return agents_moved == 0
+
     def blend_crossover(self, parent1: Agent, parent2: Agent):
-        alpha = random.uniform(0.3, 0.7)
+        alpha = self.rng.genetics.uniform(0.3, 0.7)
         child_speed = alpha * parent1.speed + (1 - alpha) * parent2.speed
         child_size = alpha * parent1.size + (1 - alpha) * parent2.size
-        return Agent(self.window, self.sl, self.cm, self.sprite, self.idg(), self.generation,
-                     speed=child_speed, size=child_size, parent1=parent1, parent2=parent2)
+        return Agent(self.context, self.sprite, self.idg(), self.generation,
+                     speed=child_speed, size=child_size, parent1_id=parent1.id, parent2_id=parent2.id,
+                     world=self.world)
 
     def mutate(self, agent: Agent):
         speed_mutation = 0
         size_mutation = 0
-        mutated = random.random() < self.mutation_chance
+        mutated = self.rng.genetics.random() < self.mutation_chance
         if mutated:
-            speed_mutation = round(random.uniform(-self.mutation_strength, self.mutation_strength), 2)
-            size_mutation = round(random.uniform(-self.mutation_strength, self.mutation_strength), 2)
+            speed_mutation = round(self.rng.genetics.uniform(-self.mutation_strength, self.mutation_strength), 2)
+            size_mutation = round(self.rng.genetics.uniform(-self.mutation_strength, self.mutation_strength), 2)
             agent.speed += speed_mutation
             agent.size += size_mutation
 
@@ -113,6 +284,37 @@ class Simulation:
 
         return mutated, speed_mutation, size_mutation
 
+    def breed_survivors(self):
+        # Auto mode breeds every survivor pair of the generation in one vectorised pass
+        survivors = self.prev_gen
+        brood = Reproduction.breed(np.array([agent.eaten for agent in survivors], dtype=float),
+                                   np.array([agent.speed for agent in survivors], dtype=float),
+                                   np.array([agent.size for agent in survivors], dtype=float),
+                                   self.rng.genetics.generator, self.mutation_chance, self.mutation_strength,
+                                   self.max_offspring)
+
+        self.offsprings = []
+        for i in range(len(brood)):
+            parent1, parent2 = survivors[brood.parent1[i]], survivors[brood.parent2[i]]
+            child = Agent(self.context, self.sprite, self.idg(), self.generation,
+                          speed=float(brood.speed[i]), size=float(brood.size[i]),
+                          parent1_id=parent1.id, parent2_id=parent2.id, world=self.world)
+
+            mutated = bool(brood.mutated[i])
+            speed_mutation, size_mutation = float(brood.speed_offset[i]), float(brood.size_offset[i])
+            if mutated:
+                child.speed += speed_mutation
+                child.size += size_mutation
+                child.mutated = True
+                child.mutation_speed_offset = speed_mutation
+                child.mutation_size_offset = size_mutation
+
+            self.offsprings.append((child, mutated, speed_mutation, size_mutation))
+            self.agents.append(child)
+
+        self.prev_gen = []
+        self.ui_parent1, self.ui_parent2 = None, None
+
     def child_policy_distribution(self, fitness):
         child_choices = np.linspace(1, self.max_offspring, self.max_offspring, dtype=int)
 
@@ -124,24 +326,30 @@ class Simulation:
 
     def next_generation(self, events):
         if len(self.prev_gen) > 1:
+            if self.is_auto:
+                # Every remaining pair at once, food is replenished on the next pass
+                self.breed_survivors()
+                return
+
             # Child policy
-            if not self.is_auto:
-                if self.card_choices is None:
-                    self.card_choices = np.random.choice(self.prev_gen, min(len(self.prev_gen), 4), replace=False).tolist()
-                    self.ui_parent1, self.ui_parent2 = None, None
+            if self.card_choices is None:
+                picks = self.rng.genetics.generator.choice(len(self.prev_gen), min(len(self.prev_gen), 4),
+                                                           replace=False)
+                self.card_choices = [self.prev_gen[i] for i in picks]
+                self.ui_parent1, self.ui_parent2 = None, None
 
-                if self.ui_parent1 is None or self.ui_parent2 is None:
+            if self.ui_parent1 is None or self.ui_parent2 is None:
+                if self.needs_redraw(events):
                     self.window.clear()
                     self.ui_agent_card.render(self.card_choices, events, self.ui_callback_parents_chose)
-                    self.window.tick()
-            else:
-                self.ui_parent1 = np.random.choice(self.prev_gen)
-                self.ui_parent2 = np.random.choice(self.prev_gen)
+                else:
+                    self.ui_agent_card.animate(self.card_choices)
+                self.window.tick()
 
             if self.ui_parent1 is not None and self.ui_parent2 is not None:
                 child_choices, child_policy = self.child_policy_distribution(self.ui_parent1.eaten + self.ui_parent2.eaten)
                 self.offsprings = []
-                for _ in range(np.random.choice(child_choices, p=child_policy)):
+                for _ in range(child_choices[self.rng.genetics.index_of(child_policy)]):
                     child = self.blend_crossover(self.ui_parent1, self.ui_parent2)
                     mutated, speed_mutation, size_mutation = self.mutate(child)
                     self.offsprings.append((child, mutated, speed_mutation, size_mutation))
@@ -158,44 +366,67 @@ class Simulation:
                 self.ui_offspring_confirmed = False
                 self.game_state = GameState.OFFSPRING_OVERVIEW
         else:
-            # Spawn new food
-            replenish_const = self.food_replenish_const
-            if self.cm.current == Condition.RAIN:
-                replenish_const *= 3
+            self.replenish_food()
 
-            food_replenish_count = (self.initial_food_amount * replenish_const /
-                                    (max(1, len(self.agents) - self.food_replenish_const)))
-            food_replenish_count *= random.uniform(0.9, 1.1)
+            self.game_state = GameState.SIM_RUNNING
+            self.is_auto = False
 
-            for _ in range(int(food_replenish_count)):
-                self.foods.append(Food(self.window, self.sl, self.cm))
+            if self.pending_record is not None:
+                self.log_generation()
 
-            if self.cm.current == Condition.DROUGHT:
-                random.shuffle(self.foods)
-                self.foods = self.foods[0:len(self.foods) // 3]
+            # A new generation is about to start, the natural point for a snapshot
+            if self.autosave is not None:
+                self.autosave(self)
 
-            self.game_state = GameState.SIM_RUNNING
-            self.is_auto = False
+    def replenish_food(self):
+        # Spawn new food for the generation about to run, scarcer the more agents there are
+        replenish_const = self.food_replenish_const
+        if self.cm.current == Condition.RAIN:
+            replenish_const *= 3
 
-    def generation_eval(self):
-        i = 0
-        while i < len(self.agents):
-            # Check if agent is fit enough
-            if self.agents[i].eaten == 0:
-                self.agents.pop(i)
-                continue
+        food_replenish_count = (self.initial_food_amount * replenish_const /
+                                (max(1, len(self.agents) - self.food_replenish_const)))
+        food_replenish_count *= self.rng.food.uniform(0.9, 1.1)
+
+        spawn_food(self.context, self.foods, int(food_replenish_count))
 
-            i += 1
+        if self.cm.current == Condition.DROUGHT:
+            self.foods.cull(len(self.foods) // 3, self.rng.food.generator)
 
-        self.prev_gen = self.agents.copy()
+    def generation_eval(self):
+        # Agents leave the world with their final state, which is what the pedigree keeps
+        if self.world is not None:
+            self.world.clear()
+        self.pedigree.extend(self.agents)
+        lived = self.agents
+
+        # Only agents that ate are fit enough to breed
+        self.prev_gen = [agent for agent in self.agents if agent.eaten > 0]
         self.agents = []
+
+        if self.telemetry is not None:
+            self.pending_record = generation_record(self.generation, self.cm.current, lived, len(self.foods),
+                                                    len(self.prev_gen))
+
+            # Without a pair of survivors there is no breeding to wait for
+            if len(self.prev_gen) < 2:
+                self.log_generation()
+
         self.cm()
         self.game_state = GameState.GAME_END_EVAL
 
+    def log_generation(self):
+        record, self.pending_record = self.pending_record, None
+        record['offspring'] = len(self.agents)
+        record['mutations'] = sum(agent.mutated for agent in self.agents)
+        self.telemetry(record)
+
     def run(self):
         # Main loop
         while True:
-            events = pygame.event.get()
+            with profiler.phase('events'):
+                events = pygame.event.get()
+
             for event in events:
                 if event.type == pygame.QUIT:
                     pygame.quit()
@@ -212,17 +443,47 @@ class Simulation:
                         elif self.game_state == GameState.SIM_PAUSED:
                             self.game_state = GameState.SIM_RUNNING
 
+                    # F3 shows per-phase frame timings
+                    if event.key == pygame.K_F3:
+                        profiler.toggle_hud()
+                        self.window.invalidate()
+
+                    # Home brings the camera back to the top-left at 1x zoom
+                    if event.key == pygame.K_HOME:
+                        self.window.camera.reset()
+                        self.window.invalidate()
+
+                    # Number keys pick the time warp
+                    warps = list(TimeWarp)
+                    if pygame.K_1 <= event.key < pygame.K_1 + len(warps):
+                        self.ui_callback_time_warp_changed(warps[event.key - pygame.K_1])
+
+                elif event.type == pygame.MOUSEWHEEL and self.game_state in (GameState.SIM_RUNNING,
+                                                                             GameState.SIM_PAUSED):
+                    self.window.camera.zoom_at(self.zoom_factor ** event.y, *pygame.mouse.get_pos())
+                    self.window.invalidate()
+
+            # Entering a screen always repaints all of it
+            if self.game_state != self.drawn_state:
+                self.window.invalidate()
+                self.drawn_state = self.game_state
+
             if self.game_state == GameState.MAIN_MENU:
+                # The menu agent roams over everything, always a full repaint
                 self.window.clear()
                 self.ui_main_menu.render(events)
+                self.window.invalidate()
                 self.window.tick()
 
             elif self.game_state == GameState.GENERATION_EVAL:
                 self.generation_eval()
 
             elif self.game_state == GameState.CONDITION_OVERVIEW:
-                self.window.clear()
-                self.ui_condition_card.render(self.cm.current, events, self.ui_callback_condition_confirmed)
+                if self.needs_redraw(events):
+                    self.window.clear()
+                    self.ui_condition_card.render(self.cm.current, events, self.ui_callback_condition_confirmed)
+                else:
+                    self.ui_condition_card.animate(self.cm.current)
                 self.window.tick()
 
             elif self.game_state == GameState.PARENTS_SELECTION:
@@ -231,8 +492,11 @@ class Simulation:
             elif self.game_state == GameState.OFFSPRING_OVERVIEW:
                 if not self.is_auto:
                     if not self.ui_offspring_confirmed:
-                        self.window.clear()
-                        self.ui_offspring_card.render(self.offsprings, events, self.ui_callback_offspring_confirmed)
+                        if self.needs_redraw(events):
+                            self.window.clear()
+                            self.ui_offspring_card.render(self.offsprings, events, self.ui_callback_offspring_confirmed)
+                        else:
+                            self.ui_offspring_card.animate(self.offsprings)
                         self.window.tick()
                     else:
                         self.game_state = GameState.PARENTS_SELECTION
@@ -244,40 +508,97 @@ class Simulation:
                     self.game_state = GameState.CONDITION_OVERVIEW
                     continue
 
-                self.window.clear()
-                self.ui_game_over.render(events, self.generation)
+                if self.needs_redraw(events):
+                    self.window.clear()
+                    self.ui_game_over.render(events, self.generation)
                 self.window.tick()
 
             elif self.game_state == GameState.AGENT_TREE:
-                self.window.clear()
-                self.ui_agent_inspect.render(events, self.ui_callback_inspect_confirm, self.ui_callback_inspect_called)
+                if self.needs_redraw(events):
+                    self.window.clear()
+                    self.ui_agent_inspect.render(events, self.ui_callback_inspect_confirm,
+                                                 self.ui_callback_inspect_called)
+                else:
+                    self.ui_agent_inspect.animate()
                 self.window.tick()
 
             elif self.game_state == GameState.SIM_RUNNING or self.game_state == GameState.SIM_PAUSED:
-                self.window.clear()
-                done = self.run_simulation(events, self.game_state == GameState.SIM_PAUSED)
+                is_paused = self.game_state == GameState.SIM_PAUSED
+                self.pan_camera()
+
+                # Nothing moves behind the pause box
+                if is_paused and not self.needs_redraw(events):
+                    self.render_profiler_hud(scene_drawn=False)
+                    self.window.tick()
+                    continue
 
-                if self.game_state == GameState.SIM_PAUSED:
-                    self.ui_pause_box.render()
+                self.window.clear()
+                done = self.run_simulation(events, is_paused)
 
                 if done:
                     self.game_state = GameState.GENERATION_EVAL
                     self.generation += 1
                     continue
 
-                self.ui_sim_bar.render(events, self.generation, len(self.agents), len(self.foods))
+                with profiler.phase('ui'):
+                    if self.game_state == GameState.SIM_PAUSED:
+                        self.ui_pause_box.render()
+
+                    self.ui_sim_bar.render(events, self.generation, len(self.agents), len(self.foods),
+                                           self.time_warp)
+
+                self.render_profiler_hud()
                 self.window.tick()
 
+    def pan_camera(self):
+        # Arrow keys held down move the view, which repaints all of it
+        keys = pygame.key.get_pressed()
+        dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * self.pan_speed * self.window.frame_time
+        dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * self.pan_speed * self.window.frame_time
+        if dx or dy:
+            self.window.camera.pan(dx, dy)
+            self.window.invalidate()
+
+    def render_profiler_hud(self, scene_drawn: bool = True):
+        if not profiler.show_hud:
+            return
+
+        # Without a fresh scene the overlay is drawn over last frame's, which its opaque box hides
+        # unless the box changed size; the next frame then redraws the scene under it
+        drawn_box = self.ui_profiler_hud.box
+        self.ui_profiler_hud.render()
+        if not scene_drawn and self.ui_profiler_hud.box != drawn_box:
+            self.window.invalidate()
+
+    def needs_redraw(self, events):
+        # Static screens repaint fully on input, and on the frame after it since callbacks may swap content
+        has_input = any(event.type in (pygame.MOUSEBUTTONUP, pygame.KEYDOWN) for event in events)
+        redraw = has_input or self.input_pending or self.window.full_redraw
+        self.input_pending = has_input
+
+        if redraw:
+            self.window.invalidate()
+
+        return redraw
+
     def reset(self):
         self.generation = 0
         self.prev_gen = []
         self.offsprings = []
         self.idg.reset()
         self.cm.reset()
+        self.pedigree.clear()
+        self.pending_record = None
         self.ui_agent_inspect = None
-        self.agents = [Agent(self.window, self.sl, self.cm,
-                             self.sprite, self.idg(), self.generation) for _ in range(self.initial_population)]
-        self.foods = [Food(self.window, self.sl, self.cm) for _ in range(self.initial_food_amount)]
+        self.drawn_agents = []
+
+        if self.world is not None:
+            self.world.clear()
+
+        self.agents = [Agent(self.context, self.sprite, self.idg(), self.generation,
+                             world=self.world) for _ in range(self.initial_population)]
+        self.foods.clear()
+        spawn_food(self.context, self.foods, self.initial_food_amount)
 
     def ui_callback_game_reset(self):
         self.reset()
@@ -314,14 +635,43 @@ class Simulation:
     def ui_callback_mutation_strength_changed(self, value: int):
         self.mutation_strength = value / 10
 
+    def ui_callback_time_warp_changed(self, time_warp: TimeWarp):
+        self.time_warp = time_warp
+        self.sim_accumulator = 0.0
+
     def ui_callback_inspect_confirm(self):
         self.ui_agent_inspect = None
         self.game_state = GameState.SIM_PAUSED
 
     def ui_callback_inspect_called(self, agent: Agent):
-        self.ui_agent_inspect = InspectAgent(self.window, self.sl, agent)
+        self.ui_agent_inspect = InspectAgent(self.window, self.sl, self.rng.visual, self.pedigree, agent)
         self.game_state = GameState.AGENT_TREE
 
 
 if __name__ == "__main__":
-    Simulation()
+    parser = argparse.ArgumentParser(description='Evolution Playground')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='Print what was loaded before the first frame and how long each step took')
+    parser.add_argument('--resume', default=None, help='Checkpoint file to continue from')
+    parser.add_argument('--autosave', default=None, help='Checkpoint file written in the background')
+    parser.add_argument('--autosave-every', type=int, default=1, help='Generations between autosaves')
+    parser.add_argument('--telemetry', default=None, help='File receiving one record per generation')
+    parser.add_argument('--telemetry-format', choices=('csv', 'jsonl', 'arrow'), default=None,
+                        help='Defaults to the telemetry file extension')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for a reproducible run')
+    parser.add_argument('--world-size', type=int, nargs=2, default=None, metavar=('WIDTH', 'HEIGHT'),
+                        help='Arena size, larger than the 1000x600 screen to scroll (arrow keys) and zoom (wheel)')
+    parser.add_argument('--profile', action='store_true', help='Start with the frame profiler HUD shown (F3)')
+    parser.add_argument('--trace', default=None, help='Chrome trace-event file of every profiled phase, written on exit')
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler.toggle_hud()
+
+    startup.verbose = args.startup_report
+    Simulation(resume=args.resume,
+               autosave=Autosave(args.autosave, args.autosave_every) if args.autosave else None,
+               telemetry=TelemetryLog(args.telemetry, args.telemetry_format) if args.telemetry else None,
+               trace=args.trace,
+               seed=args.seed,
+               world_size=tuple(args.world_size) if args.world_size else None)